@@ -359,15 +359,14 @@ def dump(oid):
 
     sai = get_sai_entity()
     obj_type = sai.vid_to_type(oid)
-    meta = sai.get_meta(obj_type)
 
-    for attr in meta['attributes']:
-        status, data = sai.get_by_type(oid, attr['name'], attr['properties']['type'], False)
+    for attr_name, attr_type in sai.get_obj_attrs(obj_type):
+        status, data = sai.get_by_type(oid, attr_name, attr_type, False)
         if status == "SAI_STATUS_SUCCESS":
             data = data.to_json()
             click.echo("{:<50} {}".format(data[0], data[1]))
         else:
-            click.echo("{:<50} {}".format(attr['name'], status))
+            click.echo("{:<50} {}".format(attr_name, status))
     click.echo()
 
 
@@ -1,130 +1,253 @@
+import copy
 import json
 import logging
 import os
 import pytest
+import time
+from collections.abc import MutableMapping
+from contextlib import contextmanager, nullcontext
 
-from saichallenger.common.sai_client.sai_client import SaiClient
+from saichallenger.common.sai_batch import SaiBatch
+from saichallenger.common.sai_client.sai_client import SaiClient, SaiFuture
 from saichallenger.common.sai_data import SaiObjType
+from saichallenger.common.sai_meta import SaiMetadata
+from saichallenger.common.sai_object_graph import SaiObjectGraph
+from saichallenger.common.sai_rec import OidRewriter, SaiRecPacer, SaiRecStats, parse_rec, read_rec
+from saichallenger.common.sai_snapshot import OID_PATTERN, SaiAsicStateDiff, SaiSnapshot
 
-class CommandProcessor:
+class SaiObjectRegistry(MutableMapping):
+    """
+    Objects registry: object name (alias) -> dict(type=..., oid=..., key=...).
+
+    Along with the registry, the reverse index (OID/key -> names) is maintained,
+    so the names of the object are found without the registry scan.
+    The registry wraps the entries dictionary, so any update goes through __setitem__()/__delitem__()
+    and keeps the index consistent. The registry holds the copies of the entries and returns
+    the shallow copies of them, so the changes of the returned entry do not affect the registry.
+    To change the entry, assign it again: registry[name] = entry.
     """
-    Process SAI commands with object reference substitution.
 
-    This class enables setup of scaled configurations by maintaining a registry
-    of created objects and substituting object references (variables starting with '$')
-    with actual OIDs or keys during command processing.
+    def __init__(self, *args, **kwargs):
+        self._entries = {}
+        self._index = {}   # OID/key -> { name -> None } in the order of the names insertion
+        self._order = {}   # name -> insertion sequence number
+        self._seq = 0
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _token(obj_key):
+        """Hashable representation of OID/key"""
+        if isinstance(obj_key, dict):
+            return ("key", json.dumps(obj_key, sort_keys=True))
+        return obj_key
+
+    def _tokens(self, entry):
+        tokens = set()
+        for field in ("oid", "key"):
+            value = entry.get(field)
+            if value is not None:
+                tokens.add(self._token(value))
+        return tokens
+
+    def _unindex(self, name):
+        for token in self._tokens(self._entries[name]):
+            names = self._index[token]
+            names.pop(name, None)
+            if not names:
+                del self._index[token]
+
+    def __getitem__(self, name):
+        return dict(self._entries[name])
+
+    def __setitem__(self, name, entry):
+        if name in self._entries:
+            self._unindex(name)
+        else:
+            self._order[name] = self._seq
+            self._seq += 1
+        entry = dict(entry)
+        if isinstance(entry.get("key"), dict):
+            entry["key"] = copy.deepcopy(entry["key"])
+        self._entries[name] = entry
+        for token in self._tokens(entry):
+            self._index.setdefault(token, {})[name] = None
+
+    def __delitem__(self, name):
+        self._unindex(name)
+        del self._entries[name]
+        del self._order[name]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __repr__(self):
+        return "SaiObjectRegistry({!r})".format(self._entries)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def popitem(self):
+        # The last inserted entry is removed first, as with dict
+        if not self._entries:
+            raise KeyError("popitem(): registry is empty")
+        name = next(reversed(self._entries))
+        return name, self.pop(name)
+
+    def clear(self):
+        self._entries.clear()
+        self._index.clear()
+        self._order.clear()
+
+    def copy(self):
+        return SaiObjectRegistry(self._entries)
+
+    def __deepcopy__(self, memo):
+        return SaiObjectRegistry(copy.deepcopy(self._entries, memo))
+
+    def __reduce__(self):
+        return SaiObjectRegistry, (self._entries,)
+
+    def names(self, obj_key):
+        """Get the names of the object by its OID or key in the order of the names registration"""
+        names = self._index.get(self._token(obj_key))
+        if not names:
+            return []
+        return sorted(names, key=self._order.__getitem__)
+
+
+class CompiledCommand:
+    """
+    SAI command (see CommandProcessor.process_command()) compiled for repeated execution.
+
+    The static parts of the command are prepared once: the dictionary key is serialized
+    into the JSON string with the placeholders for the '$VARIABLE' references,
+    and the positions of the references in the attributes are recorded.
+    So, the execution only fills in the referenced objects' OIDs/keys from the registry.
 
     Attributes:
-        objects_registry: Dictionary mapping object names to their metadata
-        sai: Reference to parent Sai instance
+        source: The original command
+        name: The object name in the registry
+        op: Operation type
+        type: The object type, or None if it is defined by the registry entry
+        key: The key/OID if the command defines it and the key is not a dictionary
+        key_parts: The serialized dictionary key split into the parts, or None
+        key_refs: List of (key_parts index, referenced object name)
+        attrs: The attributes with the references as they are in the command
+        attr_refs: List of (attrs index, referenced object name)
     """
 
-    class SubstitutionError(RuntimeError):
-        """Raised when object reference substitution fails."""
-        pass
+    __slots__ = ("source", "name", "op", "type", "has_key", "key", "key_parts", "key_refs", "attrs", "attr_refs")
 
-    def __init__(self, sai: 'Sai'):
+    def __init__(self, command):
         """
-        Initialize CommandProcessor.
+        Compile the command.
 
-        Args:
-            sai: Parent Sai instance for API calls
+        Raises:
+            AssertionError: If command format is invalid
         """
-        self.objects_registry = {}
-        self.sai = sai
+        self.source = command
+        self.name = command.get("name")
+        assert self.name, f"Invalid command {command}. Entry name is undefined"
+        self.op = command.get("op")
+        assert self.op, f"Invalid command {command}. Operation type is undefined"
+        self.type = command.get("type")
+
+        key = command.get("key", command.get("oid"))
+        self.has_key = key is not None
+        self.key = None
+        self.key_parts = None
+        self.key_refs = []
+        if isinstance(key, dict):
+            # Serialize the same way json.dumps() does
+            self.key_parts = ["{"]
+            for idx, (key_name, key_value) in enumerate(key.items()):
+                self.key_parts.append((", " if idx else "") + json.dumps(key_name) + ": ")
+                if isinstance(key_value, str) and key_value.startswith('$'):
+                    self.key_refs.append((len(self.key_parts), key_value[1:]))
+                self.key_parts.append(json.dumps(key_value))
+            self.key_parts.append("}")
+        else:
+            self.key = key
 
-    def _substitute_from_object_registry(self, obj, *args, **kwargs):
+        self.attrs = command.get("attributes", [])
+        self.attr_refs = [(idx, attr[1:]) for idx, attr in enumerate(self.attrs)
+                          if isinstance(attr, str) and attr.startswith('$')]
+
+    def resolve(self, registry):
         """
-        Substitute a reference variable with its actual value from registry.
+        Substitute the references with the actual values from the registry.
+        The references to the unknown objects are left as they are.
 
         Args:
-            obj: Object reference (string starting with '$') or regular value
-            *args: Optional default value as positional argument
-            **kwargs: Optional default value as 'default' keyword argument
+            registry: CommandProcessor objects registry
 
         Returns:
-            Registry entry for the referenced object
-
-        Raises:
-            SubstitutionError: If object is not found in registry and no default provided
+            Tuple of (object type, object key or None, attributes)
         """
-        if isinstance(obj, str) and obj.startswith('$'):
-            store_name = obj[1:]
-            try:
-                return self.objects_registry[store_name]
-            except KeyError as e:
-                try:
-                    return args[0] if args else kwargs['default']
-                except KeyError:
-                    raise self.SubstitutionError from e
+        entry = registry.get(self.name)
+        obj_type = self.type
+        if obj_type is None and entry is not None:
+            obj_type = entry["type"]
+
+        if self.key_parts is not None:
+            parts = self.key_parts
+            if self.key_refs:
+                parts = parts.copy()
+                for idx, ref in self.key_refs:
+                    obj = registry.get(ref)
+                    if obj is not None:
+                        parts[idx] = json.dumps(obj['oid'] if obj['oid'] is not None else obj['key'])
+            obj_key = "".join(parts)
+        elif self.has_key:
+            obj_key = self.key
+        elif entry is not None:
+            obj_key = entry["key"] if entry["key"] is not None else entry["oid"]
+            if isinstance(obj_key, dict):
+                obj_key = json.dumps(obj_key)
         else:
-            raise self.SubstitutionError
+            obj_key = None
 
-    def substitute_command_from_object_registry(self, command):
-        """
-        Substitute all object references in a command with actual values.
+        # SAI client might update the attributes in place
+        attrs = self.attrs.copy()
+        if self.attr_refs:
+            for idx, ref in self.attr_refs:
+                obj = registry.get(ref)
+                if obj is not None:
+                    attrs[idx] = obj['oid'] if obj['oid'] is not None else obj['key']
+        return obj_type, obj_key, attrs
 
-        Processes command dictionary and replaces:
-        - '$VARIABLE' references in keys with actual OIDs/keys
-        - '$VARIABLE' references in attributes with actual values
 
-        Args:
-            command: Dictionary containing command with possible references
+class CommandProcessor:
+    """
+    Process SAI commands with object reference substitution.
 
-        Returns:
-            New command dictionary with all references substituted
+    This class enables setup of scaled configurations by maintaining a registry
+    of created objects and substituting object references (variables starting with '$')
+    with actual OIDs or keys during command processing.
+
+    Attributes:
+        objects_registry: Dictionary mapping object names to their metadata (see SaiObjectRegistry)
+        sai: Reference to parent Sai instance
+    """
+
+    def __init__(self, sai: 'Sai'):
         """
-        substituted_command = {}
-        store_name = command.get("name")
-
-        substituted_command['type'] = command.get(
-            "type",
-            self.objects_registry.get(store_name, dict(type=None))["type"]
-        )
-        substituted_command['key'] = command.get(
-            "key",
-            self.objects_registry.get(store_name, dict(key=None))["key"]
-        )
-
-        if substituted_command['key'] is None:
-            substituted_command['key'] = command.get(
-                "oid",
-                self.objects_registry.get(store_name, dict(oid=None))["oid"]
-            )
-
-        # Substitute key
-        key = substituted_command['key']
-        if key is not None:
-            substituted_key = key
-            if isinstance(key, dict):
-                substituted_key = {}
-                for key_name, key_value in key.items():
-                    try:
-                        obj = self._substitute_from_object_registry(key_value)
-                        substituted_key[key_name] = obj['oid'] if obj['oid'] is not None else obj['key']
-                    except self.SubstitutionError:
-                        substituted_key[key_name] = key_value
-            elif isinstance(key, int):
-                substituted_key = key
-            substituted_command["key"] = substituted_key
-
-        # Substitute attrs
-        attributes = command.get("attributes", [])
-        if attributes:
-            substituted_command["attributes"] = []
-            for attr in attributes:
-                try:
-                    obj = self._substitute_from_object_registry(attr)
-                    substituted_key = obj['oid'] if obj['oid'] is not None else obj['key']
-                except self.SubstitutionError:
-                    substituted_key = attr
-                substituted_command["attributes"].append(substituted_key)
-
-        for key in set(command.keys()) - {"key", "attributes"}:
-            substituted_command[key] = command[key]
-        return substituted_command
-
-    def process_command(self, command):
+        Initialize CommandProcessor.
+
+        Args:
+            sai: Parent Sai instance for API calls
+        """
+        self.objects_registry = SaiObjectRegistry()
+        self.sai = sai
+
+    def process_command(self, command, asynchronous=False):
         """
         Process a single SAI command (create, set, get, or remove).
 
@@ -148,7 +271,10 @@ class CommandProcessor:
             },
 
         Args:
-            command: Dictionary with 'name', 'op', 'type', and optional 'key'/'attributes'
+            command: Dictionary with 'name', 'op', 'type', and optional 'key'/'attributes',
+                     or CompiledCommand (see compile())
+            asynchronous: Submit create/set/remove without waiting for the result.
+                          The SaiFuture object is returned in this case.
 
         Returns:
             Created OID for 'create', attribute values for 'get', or operation status
@@ -156,27 +282,21 @@ class CommandProcessor:
         Raises:
             AssertionError: If command format is invalid or operation fails
         """
-        store_name = command.get("name")
-        assert store_name, f"Invalid command {command}. Entry name is undefined"
-
-        operation = command.get("op")
-        assert operation, f"Invalid command {command}. Operation type is undefined"
+        if not isinstance(command, CompiledCommand):
+            command = CompiledCommand(command)
+        store_name = command.name
+        operation = command.op
 
         if operation in ["set", "get", "remove"]:
             entry = self.objects_registry.get(store_name)
-            assert entry, f"Failed to execute {command}. Unknown object {store_name}"
+            assert entry, f"Failed to execute {command.source}. Unknown object {store_name}"
 
-        command = self.substitute_command_from_object_registry(command)
-        attrs = command.get("attributes", [])
-        obj_key = command.get("key")
-
-        obj_type = command.get("type")
-        assert obj_type, f"Unknown object type for {command}"
+        obj_type, obj_key, attrs = command.resolve(self.objects_registry)
+        assert obj_type, f"Unknown object type for {command.source}"
 
         if obj_key is None:
             obj_id = obj_type
-        elif isinstance(obj_key, dict):
-            obj_key = json.dumps(obj_key)
+        elif isinstance(obj_key, str) and obj_key.startswith("{"):
             obj_id = obj_type + ":" + obj_key
         elif isinstance(obj_key, str) and obj_key.startswith("oid:0x"):
             obj_id = obj_key
@@ -184,14 +304,20 @@ class CommandProcessor:
             assert False, f"Failed to process: {obj_type}, {obj_key}, {operation}"
 
         if operation == "create":
+            if asynchronous:
+                future = self.sai.create_async(obj_id, attrs)
+                future.add_done_callback(lambda f: self._on_created(store_name, obj_type, obj_key, f))
+                return future
             obj = self.sai.create(obj_id, attrs)
-            self.objects_registry[store_name] = {
-                "type": obj_type,
-                **(dict(oid=obj, key=None) if obj_key is None else dict(oid=None, key=obj))
-            }
+            self._register_created(store_name, obj_type, obj_key, obj)
             return obj
 
         elif operation == "remove":
+            if asynchronous:
+                # Drop the object from the DB regardless of the result
+                future = self.sai.remove_async(obj_id)
+                future.add_done_callback(lambda f: self.objects_registry.pop(store_name, None))
+                return future
             try:
                 return self.sai.remove(obj_id)
             except Exception:
@@ -212,10 +338,172 @@ class CommandProcessor:
             return results
 
         elif operation == "set":
+            if asynchronous:
+                return self.sai.set_async(obj_id, attrs)
             return self.sai.set(obj_id, attrs)
         else:
             assert False, f"Unsupported operation: {operation}"
 
+    @staticmethod
+    def compile(commands):
+        """
+        Compile the commands for the repeated execution (see CompiledCommand).
+
+        Args:
+            commands: Iterable of commands (see process_command())
+
+        Returns:
+            List of CompiledCommand objects to be passed instead of the commands
+        """
+        return [command if isinstance(command, CompiledCommand) else CompiledCommand(command)
+                for command in commands]
+
+    def process_commands_concurrently(self, commands):
+        """
+        Process SAI commands dispatching the independent commands together.
+
+        The commands are split into the dependency levels (see command_levels()).
+        Within a level, create/set/remove commands are submitted without waiting
+        for each individual response. The key-based objects operations of the same
+        type are coalesced into bulk operations (see Sai.batch()). Then the level is
+        completed, and its "get" commands are executed.
+
+        Within a level, the commands are submitted grouped by (operation, object type),
+        so the commands of different types may be submitted in the order other than listed.
+        The commands of a level are independent, so this does not affect the result.
+        The commands of the same operation and type keep the listed order.
+
+        Args:
+            commands: Iterable of commands (see process_command())
+
+        Yields:
+            Commands results in the order of the commands
+        """
+        commands = self.compile(commands)
+        sources = [command.source for command in commands]
+        results = [None] * len(commands)
+        executed = [False] * len(commands)
+        next_idx = 0
+        for level in self.command_levels(sources):
+            submitted = [idx for idx in level if commands[idx].op in ["create", "set", "remove"]]
+            # Make the operations of the same type consecutive to be coalesced
+            submitted.sort(key=lambda idx: (commands[idx].op, str(commands[idx].type)))
+            with self.sai.batch():
+                for idx in submitted:
+                    results[idx] = self.process_command(commands[idx], asynchronous=True)
+            self.sai.flush()
+            for idx in level:
+                if results[idx] is None:
+                    results[idx] = self.process_command(commands[idx])
+                executed[idx] = True
+
+            while next_idx < len(commands) and executed[next_idx]:
+                result = results[next_idx]
+                yield result.result() if isinstance(result, SaiFuture) else result
+                results[next_idx] = None
+                next_idx += 1
+
+    def command_levels(self, commands):
+        """
+        Split the commands into the dependency levels.
+
+        The create/set/remove command modifies the object it is applied to and refers
+        to the other objects (see _command_references()). The command is placed to the level
+        next to the last preceding command that modified any of these objects. The command that
+        modifies the object is also placed after all the preceding commands referring to it.
+        The object removal refers to the objects the removed object refers to (as per Sai.object_graph),
+        so these objects are removed at the later levels. The dependencies of the object that is not
+        tracked by the graph (e.g., created before init() completion or through SaiClient directly)
+        are unknown. So, its removal is placed to the level after all the preceding commands,
+        and all the following commands are placed after it. The commands within a level are independent.
+
+        Args:
+            commands: List of commands (see process_command())
+
+        Returns:
+            List of the levels, each level is the list of the commands indices in the original order
+        """
+        graph = self.sai.object_graph
+        obj_names = {}
+        for name, entry in self.objects_registry.items():
+            obj_key = entry["oid"] if entry["oid"] is not None else entry["key"]
+            if obj_key is not None and entry["type"] is not None:
+                obj_names[SaiObjectGraph.object_id(entry["type"], obj_key)] = name
+
+        depth = []
+        last_write = {}  # object -> level of the last command that modified it
+        last_read = {}   # object -> max level of the commands that referred to it since the last modification
+        barrier = 0      # min level of the following commands
+        for command in commands:
+            # The command modifies the object it is applied to, and only refers to the other objects
+            name = command.get("name")
+            writes = {name}
+            key = command.get("key")
+            if isinstance(key, dict):
+                writes.add(json.dumps(key, sort_keys=True))
+            if command.get("op") not in ["create", "set", "remove"]:
+                writes.clear()
+            reads = self._command_references(command) - writes
+
+            tracked = True
+            if command.get("op") == "remove":
+                # The objects the removed object refers to must be removed after it
+                entry = self.objects_registry.get(name)
+                obj_key = None
+                if entry is not None:
+                    obj_key = entry["oid"] if entry["oid"] is not None else entry["key"]
+                obj_id = SaiObjectGraph.object_id(entry["type"], obj_key) if obj_key is not None else None
+                tracked = obj_id in graph
+                if tracked:
+                    for oids in graph.nodes[obj_id][1].values():
+                        reads.update(obj_names[oid] for oid in oids if oid in obj_names)
+
+            if tracked:
+                level = max([last_write[obj] + 1 for obj in reads | writes if obj in last_write] +
+                            [last_read[obj] + 1 for obj in writes if obj in last_read] + [barrier])
+            else:
+                # Strict order: after all the preceding commands, before all the following ones
+                level = max(depth, default=-1) + 1
+                barrier = level + 1
+            depth.append(level)
+            for obj in reads:
+                last_read[obj] = max(last_read.get(obj, level), level)
+            for obj in writes:
+                last_write[obj] = level
+                last_read.pop(obj, None)
+
+        levels = [[] for _ in range(max(depth) + 1)] if depth else []
+        for idx, level in enumerate(depth):
+            levels[level].append(idx)
+        return levels
+
+    def _on_created(self, store_name, obj_type, obj_key, future):
+        """Register the asynchronously created object. The cancelled or failed creation is ignored."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._register_created(store_name, obj_type, obj_key, future.result())
+
+    def _register_created(self, store_name, obj_type, obj_key, obj):
+        self.objects_registry[store_name] = {
+            "type": obj_type,
+            **(dict(oid=obj, key=None) if obj_key is None else dict(oid=None, key=obj))
+        }
+
+    @staticmethod
+    def _command_references(command):
+        """
+        Return the names of the objects the command refers to,
+        including the object the command is applied to.
+        """
+        refs = {command.get("name")}
+        key = command.get("key")
+        values = list(key.values()) if isinstance(key, dict) else [key]
+        values += command.get("attributes", [])
+        for value in values:
+            if isinstance(value, str) and value.startswith('$'):
+                refs.add(value[1:])
+        return refs
+
 
 class Sai():
     """
@@ -226,6 +514,12 @@ class Sai():
     """
     metadata = None
 
+    # The state discovered by init() to be captured by snapshot()
+    snapshot_fields = ["_switch_oid"]
+
+    # Bulk operation statuses that require falling back to the individual operations
+    BULK_UNSUPPORTED = ["SAI_STATUS_NOT_SUPPORTED", "SAI_STATUS_NOT_IMPLEMENTED"]
+
     def __init__(self, cfg):
         self.cfg = cfg.copy()
         self.command_processor = CommandProcessor(self)
@@ -236,7 +530,12 @@ class Sai():
         self.sku = cfg.get("sku")
         self.asic_dir = cfg.get("asic_dir")
         self._switch_oid = None
+        self._batch = None
+        self.init_snapshot = None
         self.rec2vid = {}
+        self.__rec_pending = {}
+        self.__rec_oids = OidRewriter(self.rec2vid, self.__resolve_rec_oid)
+        self.object_graph = SaiObjectGraph()
 
         cfg["client"]["config"]["saivs"] = self.libsaivs
         self.sai_client = SaiClient.spawn(cfg["client"])
@@ -250,10 +549,25 @@ class Sai():
         self.create_alias('SWITCH_ID', 'SAI_OBJECT_TYPE_SWITCH', value)
         self._switch_oid = value
 
-    def process_commands(self, commands, cleanup=False):
+    def process_commands(self, commands, cleanup=False, concurrent=False):
+        '''
+        Process data-driven SAI commands (see CommandProcessor.process_command()).
+
+        With concurrent=True, the commands are split into the dependency levels by their
+        object references. The independent create/set/remove commands of a level are submitted
+        without waiting for each individual response, the key-based objects operations
+        are coalesced into bulk operations (see CommandProcessor.process_commands_concurrently()).
+        The results are yielded in the order of the commands.
+
+        The commands can be compiled in advance to avoid the repeated preparation
+        of the same commands (see CommandProcessor.compile()).
+        '''
+        process = self.command_processor.process_commands_concurrently if concurrent else \
+            lambda cmds: map(self.command_processor.process_command, cmds)
         if cleanup:
             cleanup_commands = []
             for command in reversed(commands):
+                command = getattr(command, "source", command)
                 if command['op'] == 'create':
                     cleanup_commands.append(
                         {
@@ -262,9 +576,9 @@ class Sai():
                             'op': 'remove'
                         }
                     )
-            yield from map(self.command_processor.process_command, cleanup_commands)
+            yield from process(cleanup_commands)
         else:
-            yield from map(self.command_processor.process_command, commands)
+            yield from process(commands)
 
     def alloc_vid(self, obj_type):
         return self.sai_client.alloc_vid(obj_type)
@@ -274,24 +588,44 @@ class Sai():
         if dut:
             dut.cleanup()
         self.sai_client.cleanup()
-        self.command_processor.objects_registry = {}
+        self.command_processor.objects_registry.clear()
         self.rec2vid = {}
+        self.__rec_pending = {}
+        self.__rec_oids = OidRewriter(self.rec2vid, self.__resolve_rec_oid)
+        self.init_snapshot = None
+        self.object_graph.clear()
 
     def set_loglevel(self, sai_api, loglevel):
         return self.sai_client.set_loglevel(sai_api, loglevel)
 
     # CRUD
     def create(self, obj, attrs=[], do_assert=True):
-        return self.sai_client.create(obj, attrs, do_assert)
+        if self._batch is not None and do_assert:
+            obj_type, key = SaiBatch.split_key(obj)
+            if obj_type is not None:
+                return self.__track_future("create", obj, attrs, self._batch.create(obj_type, key, attrs), do_assert)
+        self.flush_batch()
+        return self.__track("create", obj, attrs, self.sai_client.create(obj, attrs, do_assert), do_assert)
 
     def remove(self, obj, do_assert=True):
-        return self.sai_client.remove(obj, do_assert)
+        if self._batch is not None and do_assert:
+            obj_type, key = SaiBatch.split_key(obj)
+            if obj_type is not None:
+                return self.__track_future("remove", obj, None, self._batch.remove(obj_type, key), do_assert)
+        self.flush_batch()
+        return self.__track("remove", obj, None, self.sai_client.remove(obj, do_assert), do_assert)
 
     def set(self, obj, attr, do_assert=True):
         assert len(attr) == 2, f"Failed to set {attr}. Only one attribute can be set at a time!"
-        return self.sai_client.set(obj, attr, do_assert)
+        if self._batch is not None and do_assert:
+            obj_type, key = SaiBatch.split_key(obj)
+            if obj_type is not None:
+                return self.__track_future("set", obj, attr, self._batch.set(obj_type, key, attr), do_assert)
+        self.flush_batch()
+        return self.__track("set", obj, attr, self.sai_client.set(obj, attr, do_assert), do_assert)
 
     def get(self, obj, attrs, do_assert=True):
+        self.flush_batch()
         if len(attrs) == 1:
             obj_type = self.vid_to_type(obj)
             attr = attrs[0]
@@ -304,21 +638,212 @@ class Sai():
 
         return self.sai_client.get(obj, attrs, do_assert)
 
+    # Batch
+    @contextmanager
+    def batch(self, max_size=SaiBatch.MAX_SIZE):
+        '''
+        Coalesce consecutive create/remove/set operations of the same key-based
+        object type into bulk operations. E.g.:
+
+            with npu.batch():
+                for mac in macs:
+                    npu.create_fdb(vlan_oid, mac, bp_oid)
+
+        Within the context, create()/remove()/set() (and their async variants) of key-based objects
+        with do_assert=True return SaiFuture object instead of the result. Any other SAI operation flushes
+        the buffered operations first. The remaining operations are flushed on exit.
+        Failure of any buffered operation is raised on flush.
+        '''
+        if self._batch is not None:
+            # Nested batch context
+            yield self._batch
+            return
+
+        self._batch = SaiBatch(self, max_size)
+        try:
+            yield self._batch
+        finally:
+            batch, self._batch = self._batch, None
+            batch.flush()
+
+    def flush_batch(self):
+        if self._batch is not None:
+            self._batch.flush()
+
+    # Async
+    # Within the batch context, the key-based objects operations are batched (see batch())
+    def create_async(self, obj, attrs=[], do_assert=True):
+        if self._batch is not None and do_assert and SaiBatch.split_key(obj)[0] is not None:
+            return self.create(obj, attrs)
+        self.flush_batch()
+        return self.__track_future("create", obj, attrs, self.sai_client.create_async(obj, attrs, do_assert), do_assert)
+
+    def remove_async(self, obj, do_assert=True):
+        if self._batch is not None and do_assert and SaiBatch.split_key(obj)[0] is not None:
+            return self.remove(obj)
+        self.flush_batch()
+        return self.__track_future("remove", obj, None, self.sai_client.remove_async(obj, do_assert), do_assert)
+
+    def set_async(self, obj, attr, do_assert=True):
+        assert len(attr) == 2, f"Failed to set {attr}. Only one attribute can be set at a time!"
+        if self._batch is not None and do_assert and SaiBatch.split_key(obj)[0] is not None:
+            return self.set(obj, attr)
+        self.flush_batch()
+        return self.__track_future("set", obj, attr, self.sai_client.set_async(obj, attr, do_assert), do_assert)
+
+    def get_async(self, obj, attrs, do_assert=True):
+        self.flush_batch()
+        return self.sai_client.get_async(obj, attrs, do_assert)
+
+    def flush(self):
+        self.flush_batch()
+        return self.sai_client.flush()
+
     # BULK
     def bulk_create(self, obj_type, keys, attrs, obj_count=0, do_assert=True):
-        return self.sai_client.bulk_create(obj_type, keys, attrs, obj_count, do_assert)
+        self.flush_batch()
+        result = self.sai_client.bulk_create(obj_type, keys, attrs, obj_count, do_assert)
+        _, out_keys, statuses = result
+        obj_type = self.__type_name(obj_type)
+        for idx, (key, status) in enumerate(zip(out_keys, statuses)):
+            if status == "SAI_STATUS_SUCCESS" and obj_type != "SAI_OBJECT_TYPE_SWITCH":
+                self.object_graph.add(obj_type, key, attrs[0] if len(attrs) == 1 else attrs[idx])
+        return result
 
     def bulk_remove(self, obj_type, keys, do_assert=True):
-        return self.sai_client.bulk_remove(obj_type, keys, do_assert)
+        self.flush_batch()
+        result = self.sai_client.bulk_remove(obj_type, keys, do_assert)
+        obj_type = self.__type_name(obj_type)
+        for key, status in zip(keys, result[1]):
+            if status == "SAI_STATUS_SUCCESS":
+                self.object_graph.remove(obj_type, key)
+        return result
 
     def bulk_set(self, obj_type, keys, attrs, do_assert=True):
-        return self.sai_client.bulk_set(obj_type, keys, attrs, do_assert)
+        self.flush_batch()
+        result = self.sai_client.bulk_set(obj_type, keys, attrs, do_assert)
+        obj_type = self.__type_name(obj_type)
+        for idx, (key, status) in enumerate(zip(keys, result[1])):
+            if status == "SAI_STATUS_SUCCESS":
+                self.object_graph.set(obj_type, key, attrs[0] if len(attrs) == 1 else attrs[idx])
+        return result
+
+    def bulk_create_oids(self, obj_type, attrs):
+        """
+        Create the objects of the same SAI object type with a single bulk call.
+        Falls back to the individual create calls if the bulk API is not supported.
+
+        Args:
+            obj_type: SAI object type
+            attrs: List of the attributes of each object
+
+        Returns:
+            List of the created objects OIDs
+        """
+        if not attrs:
+            return []
+        status, oids, statuses = self.bulk_create(obj_type, None, attrs, len(attrs), do_assert=False)
+        if status in self.BULK_UNSUPPORTED:
+            return [self.create(obj_type, attr) for attr in attrs]
+        assert status == "SAI_STATUS_SUCCESS", \
+            f"bulk_create({obj_type}, {len(attrs)} objects) --> {status}, {statuses}"
+        return oids
+
+    def bulk_remove_objects(self, obj_type, keys):
+        """
+        Remove the objects of the same SAI object type with a single bulk call.
+        Falls back to the individual remove calls if the bulk API is not supported.
+
+        Args:
+            obj_type: SAI object type
+            keys: List of the objects OIDs or keys
+        """
+        if not keys:
+            return
+        status, statuses = self.bulk_remove(obj_type, keys, do_assert=False)
+        if status in self.BULK_UNSUPPORTED:
+            for key in keys:
+                if isinstance(key, str) and key.startswith("oid:"):
+                    self.remove(key)
+                else:
+                    self.remove(self.__type_name(obj_type) + ":" + (key if isinstance(key, str) else json.dumps(key)))
+            return
+        assert status == "SAI_STATUS_SUCCESS", \
+            f"bulk_remove({obj_type}, {keys}) --> {status}, {statuses}"
+
+    # Object graph
+    @staticmethod
+    def __type_name(obj_type):
+        return "SAI_OBJECT_TYPE_" + obj_type.name if isinstance(obj_type, SaiObjType) else obj_type
+
+    def __track(self, op, obj, attrs, result, do_assert):
+        """Update the object graph on successful create/remove/set. Returns the operation result."""
+        if op == "create":
+            status, key = ("SAI_STATUS_SUCCESS", result) if do_assert else result
+        else:
+            status, key = ("SAI_STATUS_SUCCESS" if do_assert else result), None
+        if status != "SAI_STATUS_SUCCESS":
+            return result
+
+        if isinstance(obj, SaiObjType) or ":" not in obj:
+            obj_type = self.__type_name(obj)
+        elif obj.startswith("SAI_OBJECT_TYPE_"):
+            obj_type, key = obj.split(":", 1)
+        else:
+            obj_type, key = None, obj
+
+        if op == "create":
+            if obj_type != "SAI_OBJECT_TYPE_SWITCH":
+                self.object_graph.add(obj_type, key, attrs)
+        elif op == "remove":
+            self.object_graph.remove(obj_type, key)
+        else:
+            self.object_graph.set(obj_type, key, attrs)
+        return result
+
+    def __track_future(self, op, obj, attrs, future, do_assert):
+        future.add_done_callback(lambda f: self.__track_done(op, obj, attrs, f, do_assert))
+        return future
+
+    def __track_done(self, op, obj, attrs, future, do_assert):
+        """Update the object graph once the future is resolved. The cancelled or failed operation is ignored."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.__track(op, obj, attrs, future.result(), do_assert)
+
+    def teardown_all(self):
+        '''
+        Remove all the objects created after init() in reverse dependency order.
+
+        The removal order is computed from the object graph: an object is removed only after
+        all the objects referring to it. Each dependency level is removed with a single
+        bulk remove per object type. The CommandProcessor registry entries of the removed
+        objects are dropped.
+        '''
+        self.flush()
+        removed = set()
+        for level in self.object_graph.removal_levels():
+            keys = {}
+            for obj_id in level:
+                key = obj_id if obj_id.startswith("oid:") else json.loads(obj_id.split(":", 1)[1])
+                keys.setdefault(self.object_graph.obj_type(obj_id), []).append(key)
+            for obj_type, type_keys in keys.items():
+                self.bulk_remove_objects(obj_type, type_keys)
+            removed.update(level)
+
+        registry = self.command_processor.objects_registry
+        for name, entry in list(registry.items()):
+            obj_key = entry["oid"] if entry["oid"] is not None else entry["key"]
+            if obj_key is not None and SaiObjectGraph.object_id(entry["type"], obj_key) in removed:
+                del registry[name]
 
     # Stats
     def get_stats(self, obj, attrs, do_assert=True):
+        self.flush_batch()
         return self.sai_client.get_stats(obj, attrs, do_assert)
 
     def clear_stats(self, obj, attrs, do_assert=True):
+        self.flush_batch()
         return self.sai_client.clear_stats(obj, attrs, do_assert)
     
     # Manage flex counters
@@ -348,6 +873,7 @@ class Sai():
 
     # Flush FDB
     def flush_fdb_entries(self, obj, attrs=None):
+        self.flush_batch()
         self.sai_client.flush_fdb_entries(obj, attrs)
 
     # Host interface
@@ -371,41 +897,28 @@ class Sai():
 
     @staticmethod
     def get_meta(obj_type=None):
-        if Sai.metadata is None:
-            try:
-                with open('/etc/sai/sai.json', 'r') as f:
-                    Sai.metadata = json.load(f)
-            except IOError:
-                return None
+        meta = SaiMetadata.get()
+        if meta is None:
+            return None
+        Sai.metadata = meta.items
 
         if obj_type is None:
             return Sai.metadata
-
-        if isinstance(obj_type, SaiObjType):
-            obj_type = "SAI_OBJECT_TYPE_" + SaiObjType(obj_type).name
-        else:
-            assert isinstance(obj_type, str)
-            assert obj_type.startswith("SAI_OBJECT_TYPE_")
-
-        for item in Sai.metadata:
-            if obj_type in item.values():
-                return item
-        return None
+        return meta.get_type(obj_type)
 
     @staticmethod
     def get_obj_attrs(sai_obj_type):
-        meta = Sai.get_meta(sai_obj_type)
+        meta = SaiMetadata.get()
         if meta is None:
             return []
-        return [(attr['name'], attr['properties']['type']) for attr in meta['attributes']]
+        return list(meta.get_attrs(sai_obj_type))
 
     @staticmethod
     def get_obj_attr_type(sai_obj_type, sai_obj_attr):
-        attrs = Sai.get_obj_attrs(sai_obj_type)
-        for attr in attrs:
-            if attr[0] == sai_obj_attr:
-                return attr[1]
-        return None
+        meta = SaiMetadata.get()
+        if meta is None:
+            return None
+        return meta.get_attr_type(sai_obj_type, sai_obj_attr)
 
     def get_by_type(self, obj, attr, attr_type, do_assert=False):
         # TODO: Check how to map these types into the struct or list
@@ -492,8 +1005,125 @@ class Sai():
         return data.to_list()
 
     def get_object_key(self, obj_type=None):
+        self.flush_batch()
         return self.sai_client.get_object_key(obj_type)
 
+    def get_asic_state(self):
+        self.flush()
+        return self.sai_client.get_asic_state()
+
+    # Snapshot
+    def snapshot(self) -> SaiSnapshot:
+        '''
+        Capture ASIC state along with the state discovered by init().
+
+        Raises:
+            NotImplementedError: If SAI client does not support ASIC state retrieval
+        '''
+        fields = {name: getattr(self, name) for name in self.snapshot_fields}
+        return SaiSnapshot(self.get_asic_state(), fields,
+                           self.command_processor.objects_registry, self.rec2vid, self.object_graph)
+
+    def restore(self, snapshot: SaiSnapshot):
+        '''
+        Bring the switch back to the snapshot state by reverting only the difference
+        against the snapshot (see restore_asic_state()). No re-discovery is needed,
+        the discovered state is restored from the snapshot.
+        '''
+        self.restore_asic_state(snapshot.asic_state)
+
+        for name, value in snapshot.fields.items():
+            value = copy.deepcopy(value)
+            if isinstance(getattr(self, name, None), list):
+                # Keep the references to the list valid
+                getattr(self, name)[:] = value
+            else:
+                setattr(self, name, value)
+        # Restore the registry in place, so the references to it stay valid. The index is rebuilt on update.
+        registry = self.command_processor.objects_registry
+        registry.clear()
+        registry.update(copy.deepcopy(snapshot.objects_registry))
+        self.rec2vid = snapshot.rec2vid.copy()
+        self.__rec_pending = {}
+        self.__rec_oids = OidRewriter(self.rec2vid, self.__resolve_rec_oid)
+        self.object_graph = snapshot.object_graph.copy()
+
+    def capture_init_snapshot(self):
+        '''
+        Capture the snapshot to be restored by soft_reset().
+        Is called at the end of init(). The snapshot is not captured
+        if SAI client does not support ASIC state retrieval.
+        '''
+        try:
+            self.init_snapshot = self.snapshot()
+        except NotImplementedError:
+            self.init_snapshot = None
+
+    def soft_reset(self):
+        '''
+        Bring the switch back to the state captured right after init()
+        without Redis flush and syncd restart. Only the difference against
+        the init snapshot is reverted. Falls back to reset() on any failure.
+        '''
+        if self.init_snapshot is None:
+            self.reset()
+            return
+        try:
+            self.restore(self.init_snapshot)
+        except Exception:
+            logging.exception("Soft reset failed. Falling back to the full reset", exc_info=True)
+            self.reset()
+
+    def restore_asic_state(self, baseline):
+        '''
+        Revert the difference between the current ASIC state and the baseline:
+          1. Restore the baseline objects' attributes;
+          2. Remove the extra objects in reverse dependency order.
+             Each level of the key-based objects is removed with bulk remove per object type,
+             OID objects - with asynchronous remove;
+          3. Re-create the removed key-based objects.
+        The attributes that were not set in the baseline can not be unset. Only the references
+        from such attributes to the removed objects are reset to oid:0x0.
+        The removed OID objects can not be re-created with the same OIDs, so AssertionError is raised.
+        '''
+        diff = SaiAsicStateDiff(baseline, self.get_asic_state())
+        if not diff:
+            return
+        logging.info(f"Restoring ASIC state. {diff.summary()}")
+
+        for key in diff.missing:
+            obj_type, obj_id = SaiAsicStateDiff.split_key(key)
+            assert not obj_id.startswith("oid:"), f"Baseline object {key} was removed"
+
+        extra_oids = diff.extra_oids()
+        for key, attrs in diff.changed.items():
+            for name, value in attrs.items():
+                self.set(key, [name, value])
+        for key, attrs in diff.added.items():
+            for name, value in attrs.items():
+                if OID_PATTERN.fullmatch(value) and value in extra_oids:
+                    self.set(key, [name, "oid:0x0"])
+                else:
+                    logging.warning(f"Unable to unset {key} {name} = {value}")
+
+        for level in diff.removal_levels():
+            entries = {}
+            for key in level:
+                obj_type, obj_id = SaiAsicStateDiff.split_key(key)
+                if obj_id.startswith("oid:"):
+                    self.remove_async(key)
+                else:
+                    entries.setdefault(obj_type, []).append(obj_id)
+            self.flush()
+            for obj_type, keys in entries.items():
+                self.bulk_remove(obj_type, keys)
+
+        for key, attrs in diff.missing.items():
+            self.create(key, [item for attr in attrs.items() for item in attr])
+
+        diff = SaiAsicStateDiff(baseline, self.get_asic_state())
+        assert not (diff.extra or diff.missing or diff.changed), f"Failed to restore ASIC state. {diff.summary()}"
+
     def assert_status_success(self, status, skip_not_supported=True, skip_not_implemented=True):
         if skip_not_supported:
             if status == "SAI_STATUS_NOT_SUPPORTED" or status == "SAI_STATUS_ATTR_NOT_SUPPORTED_0":
@@ -610,9 +1240,9 @@ class Sai():
         return None
 
     def get_alias_by_key(self, obj_key):
-        for key, value in self.command_processor.objects_registry.items():
-            if (value["oid"] == obj_key or value["key"] == obj_key) and key[0].islower():
-                return key
+        for name in self.command_processor.objects_registry.names(obj_key):
+            if name[0].islower():
+                return name
         return ""
 
     def get_key_by_alias(self, alias):
@@ -657,7 +1287,7 @@ class Sai():
     def remove_rec_alias(self, obj_key):
         self.remove_alias(self.get_alias_by_key(obj_key))
 
-    def _process_create_command(self, rec):
+    def _process_create_command(self, rec, asynchronous=False, batched=False):
         """Process single object creation command ('c')."""
         attrs = []
         if len(rec) > 2:
@@ -665,22 +1295,52 @@ class Sai():
                 attrs += attr.split('=')
 
         # Update OIDs in the attributes
-        for idx in range(1, len(attrs), 2):
-            if "oid:" in attrs[idx]:
-                attrs[idx] = self.rec2vid[attrs[idx]]
+        self.__rec_oids.rewrite_attrs(attrs)
 
         obj_key = self.__update_key(rec[0], rec[1])
-        status, key = self.create(obj_key, attrs, False)
-        if status != "SAI_STATUS_SUCCESS":
+        if batched and SaiBatch.split_key(obj_key)[0] is not None:
+            # Buffered by the active batch. The key-based object is not referred to through rec2vid.
+            status = self.create(obj_key, attrs)
+            self.create_rec_alias(obj_key.split(":")[0], attrs, status.key)
             return status
+        elif asynchronous:
+            # The status is resolved on flush. The object is registered once it is created.
+            # Until then, the records referring to it wait for the creation (see __resolve_rec_oid()).
+            status = self.create_async(obj_key, attrs, False)
+            rec_oid = rec[1].split(":", 1)[1]
+            if rec_oid.startswith("oid:"):
+                self.__rec_pending[rec_oid] = status
+            status.add_done_callback(lambda f: self.__on_rec_created(rec[1], obj_key, attrs, f))
+            return status
+
+        status, key = self.create(obj_key, attrs, False)
+        if status == "SAI_STATUS_SUCCESS":
+            self.__register_rec_object(rec[1], obj_key, attrs, key)
+        return status
 
+    def __register_rec_object(self, rec_key, obj_key, attrs, key):
         if "{" not in key:
-            key_list = rec[1].split(":", 1)
+            key_list = rec_key.split(":", 1)
             self.rec2vid[key_list[1]] = key
 
         obj_type = obj_key.split(":")[0]
         self.create_rec_alias(obj_type, attrs, key)
-        return status
+
+    def __on_rec_created(self, rec_key, obj_key, attrs, future):
+        """Register the asynchronously created object. The cancelled or failed creation is ignored."""
+        rec_oid = rec_key.split(":", 1)[1]
+        if self.__rec_pending.get(rec_oid) is future:
+            del self.__rec_pending[rec_oid]
+        if future.cancelled() or future.exception() is not None:
+            return
+        status, key = future.result()
+        if status == "SAI_STATUS_SUCCESS":
+            self.__register_rec_object(rec_key, obj_key, attrs, key)
+
+    def __resolve_rec_oid(self, oid):
+        """Complete the pending asynchronous creation of the recorded object"""
+        if oid in self.__rec_pending:
+            self.flush()
 
     def _process_bulk_create_command(self, record):
         """Process bulk object creation command ('C')."""
@@ -694,9 +1354,7 @@ class Sai():
                 attrs += attr.split('=')
 
             # Update OIDs in the attributes
-            for i in range(1, len(attrs), 2):
-                if "oid:" in attrs[i] and attrs[i] != "oid:0x0":
-                    attrs[i] = self.rec2vid[attrs[i]]
+            self.__rec_oids.rewrite_attrs(attrs)
 
             # Convert into "sai-object-type:key"
             key = record[0][1] + ":" + record[idx + 1][0]
@@ -722,13 +1380,14 @@ class Sai():
         for idx in range(len(bulk_keys)):
             self.create_rec_alias(record[0][1], bulk_attrs[idx], bulk_keys[idx])
 
-    def _process_set_command(self, rec):
+    def _process_set_command(self, rec, asynchronous=False):
         """Process single attribute set command ('s')."""
-        data = rec[2].split('=')
-        if "oid:" in data[1]:
-            data[1] = self.rec2vid[data[1]]
+        data = self.__rec_oids.rewrite_attrs(rec[2].split('='))
 
-        self.set(self.__update_key(rec[0], rec[1]), data)
+        if asynchronous:
+            self.set_async(self.__update_key(rec[0], rec[1]), data)
+        else:
+            self.set(self.__update_key(rec[0], rec[1]), data)
 
     def _process_bulk_set_command(self, record):
         """Process bulk attribute set command ('S')."""
@@ -736,9 +1395,7 @@ class Sai():
         bulk_keys = []
         bulk_attrs = []
         for idx, entry in enumerate(record[1:]):
-            attr = entry[1].split('=')
-            if "oid:" in attr[1] and attr[1] != "oid:0x0":
-                attr[1] = self.rec2vid[attr[1]]
+            attr = self.__rec_oids.rewrite_attrs(entry[1].split('='))
 
             # Convert into "sai-object-type:key"
             key = record[0][1] + ":" + record[idx + 1][0]
@@ -755,10 +1412,13 @@ class Sai():
 
         self.bulk_set(record[0][1], bulk_keys, bulk_attrs)
 
-    def _process_remove_command(self, rec):
+    def _process_remove_command(self, rec, asynchronous=False):
         """Process single object removal command ('r')."""
         obj_key = self.__update_key(rec[0], rec[1])
-        self.remove(obj_key)
+        if asynchronous:
+            self.remove_async(obj_key)
+        else:
+            self.remove(obj_key)
         self.remove_rec_alias(obj_key)
 
     def _process_bulk_remove_command(self, record):
@@ -806,14 +1466,8 @@ class Sai():
             attrs += attr.split('=')
 
         G_oids = []
-        for idx in range(1, len(attrs), 2):
-            G_output = attrs[idx]
-
-            if ":oid:" in G_output:
-                start_idx = G_output.find(":") + 1
-                G_oids += G_output[start_idx:].split(",")
-            elif "oid:" in G_output:
-                G_oids.append(G_output)
+        for value in attrs[1::2]:
+            G_oids += OID_PATTERN.findall(value)
 
         assert len(oids) == len(G_oids), f"Expected data {oids}. Actual data {G_oids}"
 
@@ -823,46 +1477,113 @@ class Sai():
 
     def _process_expected_failure_command(self, rec, status):
         """Process expected failure command ('E')."""
+        if isinstance(status, SaiFuture):
+            self.flush()
+            status = status.result()[0]
         assert status in [rec[1], "SAI_STATUS_SUCCESS"], \
             f"Expected fail reason is {rec[1]}. Actual fail reason is {status}"
 
-    def apply_rec(self, fname):
+    def apply_rec(self, fname, concurrent=False, batched=False, verbose=1, stats_file=None, trace_file=None,
+                  speed=None):
+        '''
+        Replay sairedis.rec file.
+
+        The file is read, parsed and replayed record by record, so the replay starts
+        right away and the memory usage does not depend on the file size.
+        The gzip compressed files are supported. To replay the rotated files,
+        pass the list of the files (see sai_rec.rotated_files()).
+
+        With concurrent=True, single create/set/remove records are submitted
+        without waiting for each individual response (see SaiClient.create_async()).
+
+        With batched=True, consecutive single create/set/remove records of the same
+        key-based object type (FDB, route, neighbor entries, etc.) are replayed
+        as bulk operations (see batch()). The record followed by the expected failure ('E')
+        is replayed on its own. Failure of any other batched record is raised on flush.
+        The records of OID objects are not batched, since the VIDs they get are required
+        to substitute the OIDs of the subsequent records.
+
+        Verbosity levels:
+            0 - no output
+            1 - final rec2vid mapping
+            2 - every record
+
+        The replay statistics (see sai_rec.SaiRecStats) are returned and, optionally,
+        written to stats_file as JSON. The per-record timing is written to trace_file as JSON lines.
+
+        The requests are paced according to the records' timestamps (see sai_rec.SaiRecPacer):
+            speed=None - as fast as possible
+            speed=1    - real-time, the original inter-arrival gaps are reproduced
+            speed=N    - N times faster than the original
+        The lag behind the schedule is reported in the "schedule" section of the statistics.
+        '''
         # Since it's expected that sairedis.rec file contains a full configuration,
         # before we start, we must flush both RPC backend (Redis or Thrift server) and NPU state.
         self.cleanup()
 
         oids = []
         status = None
-        records = self.__parse_rec(fname)
-        for cnt, record in records.items():
-            print("#{}: {}".format(cnt, record))
-            rec = record[0]
-            if rec[1] and not rec[1].startswith("SAI_"):
-                print("Ignored line {}: {}".format(cnt, rec))
-                continue
-
-            if rec[0] == 'c':
-                status = self._process_create_command(rec)
-            elif rec[0] == 'C':
-                self._process_bulk_create_command(record)
-            elif rec[0] == 's':
-                self._process_set_command(rec)
-            elif rec[0] == 'S':
-                self._process_bulk_set_command(record)
-            elif rec[0] == 'r':
-                self._process_remove_command(rec)
-            elif rec[0] == 'R':
-                self._process_bulk_remove_command(record)
-            elif rec[0] == 'g':
-                status = self._process_get_command(rec, oids)
-            elif rec[0] == 'G':
-                self._process_get_response_command(rec, oids)
-            elif rec[0] == 'E':
-                self._process_expected_failure_command(rec, status)
-            else:
-                print("Ignored line {}: {}".format(cnt, rec))
+        records = parse_rec(read_rec(fname))
+        with open(trace_file, "w") if trace_file else nullcontext() as trace, \
+                self.batch() if batched else nullcontext():
+            stats = SaiRecStats(trace)
+            pacer = SaiRecPacer(speed)
+            # The next record is looked ahead to check whether the failure is expected
+            next_record = next(records, None)
+            while next_record is not None:
+                cnt, timestamp, record = next_record
+                next_record = next(records, None)
+                if verbose > 1:
+                    print("#{}: {}".format(cnt, record))
+                rec = record[0]
+                if rec[0] not in "GE":
+                    # The responses are not paced
+                    pacer.wait(timestamp)
+                start = time.perf_counter()
+
+                if rec[0] == 'c':
+                    # Switch creation is followed by objects discovery
+                    asynchronous = concurrent and not rec[1].startswith("SAI_OBJECT_TYPE_SWITCH:")
+                    expect_failure = next_record is not None and next_record[2][0][0] == 'E'
+                    status = self._process_create_command(rec, asynchronous, batched and not expect_failure)
+                elif rec[0] == 'C':
+                    self._process_bulk_create_command(record)
+                elif rec[0] == 's':
+                    self._process_set_command(rec, concurrent)
+                elif rec[0] == 'S':
+                    self._process_bulk_set_command(record)
+                elif rec[0] == 'r':
+                    self._process_remove_command(rec, concurrent)
+                elif rec[0] == 'R':
+                    self._process_bulk_remove_command(record)
+                elif rec[0] == 'g':
+                    status = self._process_get_command(rec, oids)
+                elif rec[0] == 'G':
+                    self._process_get_response_command(rec, oids)
+                elif rec[0] == 'E':
+                    self._process_expected_failure_command(rec, status)
+                else:
+                    if verbose > 1:
+                        print("Ignored line {}: {}".format(cnt, rec))
+                    continue
 
-        print("Current SAI objects: {}".format(self.rec2vid))
+                stats.add(cnt, record, time.perf_counter() - start)
+
+            # The buffered records are submitted on exit from the batch context
+            start = time.perf_counter()
+
+        self.flush()
+        stats.finish(time.perf_counter() - start)
+        pacer.finish()
+        if verbose > 0:
+            print("Current SAI objects: {}".format(self.rec2vid))
+
+        summary = stats.summary()
+        summary["schedule"] = pacer.summary()
+        if stats_file:
+            with open(stats_file, "w") as f:
+                json.dump(summary, f, indent=4)
+        return summary
 
     def __update_oid_key(self, action, key):
         key_list = key.split(":", 1)
@@ -872,55 +1593,19 @@ class Sai():
             # Return object's type in "SAI_OBJECT_TYPE_XXXX" format
             return key_list[0]
         elif action == "g" or action == "s" or action == "S":
+            self.__resolve_rec_oid(key_list[1])
             vid = self.rec2vid[key_list[1]]
         elif action == "r" or action == "R":
+            self.__resolve_rec_oid(key_list[1])
             vid = self.rec2vid.pop(key_list[1])
 
         return key_list[0] + ":" + vid
 
     def __update_entry_key_oids(self, key):
-        oids = []
-        new_key = key
-        key_list = key.split("\"")
-        for k in key_list:
-            if "oid:" in k:
-                oids.append(k)
-        for oid in oids:
-            new_oid = self.rec2vid[oid]
-            new_key = new_key.replace(oid, new_oid)
-        return new_key
+        return self.__rec_oids.rewrite(key)
 
     def __update_key(self, action, key):
         if "{" in key:
             return self.__update_entry_key_oids(key)
         else:
             return self.__update_oid_key(action, key)
-
-    def __parse_rec(self, fname):
-        '''
-        Non-bulk entry format:
-        data|action|sai-object-type:key|attr1|attr2
-
-        Will be converted into:
-        [["action", "sai-object-type:key", "attr1", "attr2"]]
-
-        Bulk entry format:
-        data|action|sai-object-type||key1|attr1|attr2||...||key-n|attr1|attr2
-
-        Will be converted into:
-        [["action", "sai-object-type"], ["key", "attr1", "attr2"], ..., [key-n", "attr1", "attr2"]]
-        '''
-        cnt = 0
-        rec = {}
-        fp = open(fname, 'r')
-        for line in fp:
-            data = []
-            cnt += 1
-            bulk_tokens = line.strip().split("||")
-            for idx, token in enumerate(bulk_tokens):
-                tokens = token.strip().split("|")
-                if idx == 0:
-                    tokens = tokens[1:]
-                data.append(tokens)
-            rec[cnt] = data #if len(data) > 1 else data[0]
-        return rec
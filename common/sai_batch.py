@@ -0,0 +1,115 @@
+import json
+
+from saichallenger.common.sai_client.sai_client import SaiFuture
+
+
+class SaiBatch:
+    """
+    Coalesce single SAI operations into bulk operations.
+
+    Consecutive create/remove/set operations of the same key-based object type
+    (FDB entry, route entry, neighbor entry, etc.) are buffered and then
+    submitted with a single bulk_create()/bulk_remove()/bulk_set() call.
+    Every buffered operation gets SaiFuture object that is resolved
+    with the status of the individual entry once the batch is flushed.
+
+    The batch is flushed when the object type or operation changes,
+    when the number of the buffered operations reaches max_size,
+    or when flush() is called explicitly.
+    """
+
+    MAX_SIZE = 1024
+
+    def __init__(self, sai, max_size=MAX_SIZE):
+        """
+        Initialize SaiBatch.
+
+        Args:
+            sai: Parent Sai instance
+            max_size: Max number of operations to submit within one bulk operation
+        """
+        assert max_size > 0
+        self.sai = sai
+        self.max_size = max_size
+        self.op = None
+        self.obj_type = None
+        self.entries = []
+
+    @staticmethod
+    def split_key(obj):
+        """
+        Split the key-based object into the object type and the key.
+        Returns (None, None) for OID objects.
+        """
+        if not isinstance(obj, str) or not obj.startswith("SAI_OBJECT_TYPE_"):
+            return None, None
+        obj_type, _, key = obj.partition(":")
+        if not key.startswith("{"):
+            return None, None
+        return obj_type, json.loads(key)
+
+    def create(self, obj_type, key, attrs):
+        return self.__add("create", obj_type, key, attrs)
+
+    def remove(self, obj_type, key):
+        return self.__add("remove", obj_type, key, None)
+
+    def set(self, obj_type, key, attr):
+        return self.__add("set", obj_type, key, attr)
+
+    def __add(self, op, obj_type, key, attrs):
+        if (op, obj_type) != (self.op, self.obj_type):
+            self.flush()
+            self.op = op
+            self.obj_type = obj_type
+
+        if attrs is not None:
+            attrs = [attr if isinstance(attr, str) else json.dumps(attr) for attr in attrs]
+
+        future = SaiFuture(key)
+        self.entries.append((key, attrs, future))
+        if len(self.entries) >= self.max_size:
+            self.flush()
+        return future
+
+    def flush(self):
+        """
+        Submit the buffered operations.
+        Raises the error of the first failed operation.
+        """
+        if not self.entries:
+            return
+
+        op, obj_type, entries = self.op, self.obj_type, self.entries
+        self.op = None
+        self.obj_type = None
+        self.entries = []
+
+        keys = [key for key, _, _ in entries]
+        attrs = [attr for _, attr, _ in entries]
+        sai_client = self.sai.sai_client
+        if op == "create":
+            status, _, statuses = sai_client.bulk_create(obj_type, keys, attrs, do_assert=False)
+        elif op == "remove":
+            status, statuses = sai_client.bulk_remove(obj_type, keys, do_assert=False)
+        else:
+            status, statuses = sai_client.bulk_set(obj_type, keys, attrs, do_assert=False)
+
+        if len(statuses) != len(entries):
+            # The client did not report per-entry statuses
+            statuses = [status] * len(entries)
+
+        error = None
+        for (key, attr, future), entry_status in zip(entries, statuses):
+            if entry_status == "SAI_STATUS_SUCCESS":
+                future.set_result(key if op == "create" else entry_status)
+                continue
+            if op == "remove":
+                msg = f"{op}({obj_type}:{json.dumps(key)}) --> {entry_status}"
+            else:
+                msg = f"{op}({obj_type}:{json.dumps(key)}, {attr}) --> {entry_status}"
+            future.set_exception(AssertionError(msg))
+            error = error or future.exception()
+
+        if error is not None:
+            raise error
@@ -1,9 +1,36 @@
 import sys
 import time
 import os
+from concurrent.futures import Future
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+
+class SaiFuture(Future):
+    """
+    The result of asynchronous SAI operation.
+
+    Besides the standard Future API, it holds the key (OID or entry)
+    of the SAI object the operation was submitted for. For create operation,
+    the key is known immediately after submission, before the result is available.
+    """
+    def __init__(self, key=None):
+        super().__init__()
+        self.key = key
+
+    @staticmethod
+    def completed(result, key=None) -> 'SaiFuture':
+        future = SaiFuture(key)
+        future.set_result(result)
+        return future
+
+    @staticmethod
+    def failed(error, key=None) -> 'SaiFuture':
+        future = SaiFuture(key)
+        future.set_exception(error)
+        return future
+
+
 class SaiClient:
     """SAI client interface to wrap low level SAI calls. Is used to define own SAI wrappers"""
     def __init__(self, client_config):
@@ -45,6 +72,56 @@ class SaiClient:
         """
         raise NotImplementedError
 
+    # Async
+    # The default implementation is synchronous. As with the asynchronous clients, the operation error
+    # is held by the returned future and, for do_assert=True, raised by the following flush().
+    def create_async(self, obj, attrs, do_assert=True) -> SaiFuture:
+        """
+        Submit SAI object creation without waiting for the result.
+        The result of the future is the same as create() returns.
+        """
+        future = self._run_async(lambda: self.create(obj, attrs, do_assert), None, do_assert)
+        if future.exception() is None:
+            future.key = future.result() if do_assert else future.result()[1]
+        return future
+
+    def remove_async(self, obj, do_assert=True) -> SaiFuture:
+        """
+        Submit SAI object removal without waiting for the result.
+        """
+        return self._run_async(lambda: self.remove(obj, do_assert), obj, do_assert)
+
+    def set_async(self, obj, attr, do_assert=True) -> SaiFuture:
+        """
+        Submit SAI object attribute set without waiting for the result.
+        """
+        return self._run_async(lambda: self.set(obj, attr, do_assert), obj, do_assert)
+
+    def get_async(self, obj, attrs, do_assert=True) -> SaiFuture:
+        """
+        Submit SAI object attributes get without waiting for the result.
+        The result of the future is the same as get() returns.
+        """
+        return self._run_async(lambda: self.get(obj, attrs, do_assert), obj, do_assert)
+
+    def _run_async(self, operation, key, do_assert):
+        try:
+            return SaiFuture.completed(operation(), key)
+        except Exception as e:
+            if do_assert and getattr(self, "_async_error", None) is None:
+                self._async_error = e
+            return SaiFuture.failed(e, key)
+
+    def flush(self):
+        """
+        Wait for all submitted asynchronous operations to complete.
+        Raises the error of the first failed operation submitted with do_assert=True.
+        """
+        error = getattr(self, "_async_error", None)
+        if error is not None:
+            self._async_error = None
+            raise error
+
     # Stats
     def get_stats(self, obj, attrs, do_assert=True):
         raise NotImplementedError
@@ -114,6 +191,14 @@ class SaiClient:
         '''
         raise NotImplementedError
 
+    def get_asic_state(self):
+        '''
+        Returns a dictionary where SAI object key is a key,
+        and the dictionary of the object's attributes is a value. E.g.:
+        { "SAI_OBJECT_TYPE_VLAN:oid:0x26000000000001": { "SAI_VLAN_ATTR_VLAN_ID": "1" }, ... }
+        '''
+        raise NotImplementedError
+
     @staticmethod
     def spawn(params) -> 'SaiClient':
         """Load different SAI client implementations based on parameters"""
@@ -2,8 +2,10 @@ import json
 import redis
 import time
 import os
+from collections import deque
+from functools import lru_cache
 
-from saichallenger.common.sai_client.sai_client import SaiClient
+from saichallenger.common.sai_client.sai_client import SaiClient, SaiFuture
 from saichallenger.common.sai_data import SaiObjType, SaiData
 
 SAI_COUNTER_TYPE_TO_ID_LIST = {
@@ -44,6 +46,30 @@ class SaiRedisClient(SaiClient):
 
         self.is_dut_mbr = cfg.get("mode") is not None
 
+        # Response wait mode:
+        #   "poll"   - poll GETRESPONSE queue with a fixed sleep interval;
+        #   "notify" - block on syncd's GETRESPONSE channel notifications.
+        self.response_wait = cfg.get("response_wait", "poll")
+        assert self.response_wait in ["poll", "notify"], f"Unsupported response wait mode {self.response_wait}"
+        self.response_pubsub = None
+
+        # Send request and consume response through MULTI/EXEC transactions
+        self.pipeline = cfg.get("pipeline", False)
+
+        # Redis round trips done on behalf of SAI operations
+        self.rpc_stats = {"ops": 0, "round_trips": 0}
+
+        # The max number of asynchronous SAI operations in flight
+        self.async_window = int(cfg.get("async_window", 64))
+        self.async_pending = deque()
+        # The error of the first failed asynchronous operation submitted with do_assert=True, raised by flush()
+        self.async_error = None
+
+        # VIDs known to exist: VID -> RID, or None if RID has not been retrieved yet
+        self.vid_cache = {}
+        # Do not check VID existence before SAI operation
+        self.skip_vid_check = cfg.get("skip_vid_check", False)
+
         self.r = redis.Redis(host=self.server_ip, port=self.port, db=self.asic_db)
         self.loglevel_db = redis.Redis(host=self.server_ip, port=self.port, db=3)
         self.counters_db = redis.Redis(host=self.server_ip, port=self.port, db=2, decode_responses=True)
@@ -58,6 +84,9 @@ class SaiRedisClient(SaiClient):
         created. To ensure this, the framework should flush Redis DB content
         and restart syncd application linked with SAI library.
         '''
+        self.__drop_async_pending()
+        # The VIDs of the objects created before the cleanup are stale
+        self.vid_cache.clear()
         if self.is_dut_mbr:
             self.__assert_syncd_running()
             return
@@ -76,6 +105,7 @@ class SaiRedisClient(SaiClient):
              option in `supervisord.conf` file.
         '''
         self.assert_process_running(self.port, self.server_ip, "Redis server has not started yet...")
+        self.__close_response_pubsub()
         self.r.flushall()
         self.loglevel_db.hset('syncd:syncd', mapping={'LOGLEVEL':self.loglevel, 'LOGOUTPUT':'SYSLOG'})
         self.r.shutdown()
@@ -107,14 +137,170 @@ class SaiRedisClient(SaiClient):
         self.loglevel_db.publish(sai_api + "_CHANNEL@3", "G")
 
     def operate(self, obj, attrs, op):
+        # Responses are matched to requests in order.
+        # So, all asynchronous operations must be completed first.
+        # Their errors are raised by flush() only, not on behalf of this operation.
+        self.__complete_async_pending()
+
+        if self.asic_channel is None:
+            self.__assert_syncd_running()
+
+        if self.response_wait == "notify":
+            self.__subscribe_response_channel()
+
+        obj = self.__normalize_key(obj)
+
+        self.rpc_stats["ops"] += 1
+        if self.pipeline:
+            # Clean-up Redis RPC I/O pipe and send the request in one transaction
+            with self.r.pipeline(transaction=True) as pipe:
+                pipe.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+                pipe.lpush("ASIC_STATE_KEY_VALUE_OP_QUEUE", obj, attrs, op)
+                pipe.publish(self.asic_channel, "G")
+                pipe.execute()
+            self.rpc_stats["round_trips"] += 1
+        else:
+            # Clean-up Redis RPC I/O pipe
+            self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+            status = self.r.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
+            assert len(status) == 0, "Redis RPC I/O failure!"
+
+            self.r.lpush("ASIC_STATE_KEY_VALUE_OP_QUEUE", obj, attrs, op)
+            self.r.publish(self.asic_channel, "G")
+            self.rpc_stats["round_trips"] += 4
+
+        tout, attempts = self.__response_timeout(obj, op)
+
+        # Get response
+        if self.response_wait == "notify":
+            status = self.__wait_response_notify(tout * attempts)
+        else:
+            status = self.__wait_response_poll(tout, attempts)
+
+        if not self.pipeline:
+            self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+            self.rpc_stats["round_trips"] += 1
+
+        assert len(status) == 3, f"SAI \"{op[1:]}\" operation failure!"
+        return status
+
+    def operate_async(self, obj, attrs, op, on_response, key=None, do_assert=True):
+        '''
+        Sends SAI operation request without waiting for the response.
+
+        Syncd processes ASIC_STATE_KEY_VALUE_OP_QUEUE in order and pushes
+        the responses into GETRESPONSE_KEY_VALUE_OP_QUEUE in the same order.
+        So, the responses are matched to the outstanding requests in FIFO order.
+        Up to `async_window` requests can be in flight. When the window is full,
+        the oldest request is completed before the new one is sent.
+
+        Parameters:
+            obj (str): SAI object key
+            attrs (str): serialized attributes
+            op (str): SAI operation ("Screate", "Dremove", "Sset", etc.)
+            on_response (callable): converts the raw response into the future's result
+            key: SAI object key (OID or entry) to be stored in the future
+            do_assert (bool): whether flush() should raise the operation error
+        Returns:
+            SaiFuture object
+        '''
         if self.asic_channel is None:
             self.__assert_syncd_running()
 
-        # Clean-up Redis RPC I/O pipe
-        self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
-        status = self.r.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
-        assert len(status) == 0, "Redis RPC I/O failure!"
+        if self.response_wait == "notify":
+            self.__subscribe_response_channel()
+
+        if not self.async_pending:
+            # Clean-up Redis RPC I/O pipe
+            self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+            self.rpc_stats["round_trips"] += 1
+
+        obj = self.__normalize_key(obj)
+
+        self.rpc_stats["ops"] += 1
+        with self.r.pipeline(transaction=self.pipeline) as pipe:
+            pipe.lpush("ASIC_STATE_KEY_VALUE_OP_QUEUE", obj, attrs, op)
+            pipe.publish(self.asic_channel, "G")
+            pipe.execute()
+        self.rpc_stats["round_trips"] += 1
 
+        future = SaiFuture(key)
+        future.do_assert = do_assert
+        self.async_pending.append((future, on_response, self.__response_timeout(obj, op)))
+
+        if len(self.async_pending) >= self.async_window:
+            self.__complete_async_oldest()
+        return future
+
+    def flush(self):
+        '''
+        Waits for all outstanding asynchronous operations to complete.
+        Raises the error of the first failed operation submitted with do_assert=True
+        since the previous flush().
+        '''
+        self.__complete_async_pending()
+        error, self.async_error = self.async_error, None
+        if error is not None:
+            raise error
+
+    def __complete_async_pending(self):
+        while self.async_pending:
+            self.__complete_async_oldest()
+
+    def __complete_async_oldest(self):
+        future, on_response, (tout, attempts) = self.async_pending.popleft()
+        if self.response_wait == "notify":
+            status = self.__wait_response_notify(tout * attempts, self.__pop_async_response)
+        else:
+            status = self.__wait_response_poll(tout, attempts, self.__pop_async_response)
+        if len(status) < 3:
+            # The late response would be taken by the next request, so the responses
+            # of the remaining requests can not be matched anymore
+            self.__fail_async(future, AssertionError("SAI asynchronous operation failure!"))
+            while self.async_pending:
+                pending, _, _ = self.async_pending.popleft()
+                self.__fail_async(pending, AssertionError(
+                    "SAI asynchronous operation response is lost due to the timeout of the preceding operation"))
+            self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+            self.rpc_stats["round_trips"] += 1
+            return future
+        try:
+            future.set_result(on_response(status))
+        except Exception as e:
+            self.__fail_async(future, e)
+        return future
+
+    def __fail_async(self, future, error):
+        future.set_exception(error)
+        if future.do_assert and self.async_error is None:
+            self.async_error = error
+
+    def __pop_async_response(self):
+        # The oldest response is at the tail of the queue
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", -3, -1)
+            pipe.ltrim("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -4)
+            status, _ = pipe.execute()
+        self.rpc_stats["round_trips"] += 1
+        if len(status) < 3:
+            # Nothing has been consumed by LTRIM
+            return []
+        return status
+
+    def __drop_async_pending(self):
+        while self.async_pending:
+            future, _, _ = self.async_pending.popleft()
+            future.cancel()
+        self.async_error = None
+
+    def __response_timeout(self, obj, op):
+        if obj.startswith("SAI_OBJECT_TYPE_SWITCH") and op == "Screate":
+            # Wait upto 3 mins for switch init
+            return 0.5, 240
+        return 0.01, self.attempts
+
+    @staticmethod
+    def __normalize_key(obj):
         # Remove spaces from the key string.
         # Required by sai_deserialize_route_entry() in sonic-sairedis.
         obj = obj.replace(' ', '')
@@ -126,32 +312,99 @@ class SaiRedisClient(SaiClient):
         if "ip_address" in obj:
             obj = obj.replace("ip_address", "ip")
             obj = obj.replace("rif_id", "rif")
+        return obj
 
-        self.r.lpush("ASIC_STATE_KEY_VALUE_OP_QUEUE", obj, attrs, op)
-        self.r.publish(self.asic_channel, "G")
+    @staticmethod
+    def __serialize_key(key):
+        # The bulk entry key is normalized the same way as the single operation's key
+        if type(key) != str:
+            key = json.dumps(key)
+        return SaiRedisClient.__normalize_key(key)
 
-        if obj.startswith("SAI_OBJECT_TYPE_SWITCH") and op == "Screate":
-            # Wait upto 3 mins for switch init
-            tout = 0.5
-            attempts = 240
-        else:
-            tout = 0.01
-            attempts = self.attempts
+    def get_rpc_stats(self):
+        '''
+        Returns the number of SAI operations sent to syncd and the number
+        of Redis round trips done on behalf of these operations.
+        '''
+        stats = self.rpc_stats.copy()
+        stats["round_trips_per_op"] = stats["round_trips"] / stats["ops"] if stats["ops"] else 0
+        return stats
+
+    def reset_rpc_stats(self):
+        self.rpc_stats = {"ops": 0, "round_trips": 0}
+
+    def __read_response(self):
+        if not self.pipeline:
+            self.rpc_stats["round_trips"] += 1
+            return self.r.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
+
+        # Syncd pushes the whole response atomically,
+        # so it's safe to consume and delete it in one transaction.
+        with self.r.pipeline(transaction=True) as pipe:
+            pipe.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
+            pipe.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+            status, _ = pipe.execute()
+        self.rpc_stats["round_trips"] += 1
+        return status
 
-        # Get response
-        status = self.r.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
+    def __wait_response_poll(self, tout, attempts, read_response=None):
+        read_response = read_response or self.__read_response
+        status = read_response()
         while len(status) < 3 and attempts > 0:
             assert self.__check_syncd_running(), "FATAL - SyncD has exited or crashed!"
             time.sleep(tout)
             attempts -= 1
-            status = self.r.lrange("GETRESPONSE_KEY_VALUE_OP_QUEUE", 0, -1)
+            status = read_response()
+        return status
 
-        self.r.delete("GETRESPONSE_KEY_VALUE_OP_QUEUE")
+    def __wait_response_notify(self, tout, read_response=None):
+        '''
+        Waits for syncd response by blocking on GETRESPONSE channel.
 
-        assert len(status) == 3, f"SAI \"{op[1:]}\" operation failure!"
+        Syncd publishes a notification into GETRESPONSE channel each time
+        it pushes the response into GETRESPONSE_KEY_VALUE_OP_QUEUE.
+        The channel is subscribed before the request is sent (see operate()),
+        so the notification cannot be missed. Syncd liveness is checked
+        only when the deadline expires.
+        '''
+        read_response = read_response or self.__read_response
+        deadline = time.monotonic() + tout
+        status = [] if read_response == self.__read_response else read_response()
+        while len(status) < 3:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                assert self.__check_syncd_running(), "FATAL - SyncD has exited or crashed!"
+                break
+            if self.response_pubsub.get_message(timeout=remaining) is None:
+                continue
+            status = read_response()
         return status
 
+    def __subscribe_response_channel(self):
+        if self.response_pubsub is not None:
+            return
+        self.response_pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+        # SONiC 202111 or older publishes into "GETRESPONSE_CHANNEL",
+        # SONiC 202205 or newer - into "GETRESPONSE_CHANNEL@<db>".
+        self.response_pubsub.subscribe("GETRESPONSE_CHANNEL", f"GETRESPONSE_CHANNEL@{self.asic_db}")
+
+    def __close_response_pubsub(self):
+        if self.response_pubsub is not None:
+            self.response_pubsub.close()
+            self.response_pubsub = None
+
     def create(self, obj, attrs, do_assert=True):
+        obj, attrs, vid = self.__create_request(obj, attrs)
+        status = self.operate(obj, attrs, "Screate")
+        return self.__create_response(obj, attrs, vid, status, do_assert)
+
+    def create_async(self, obj, attrs, do_assert=True):
+        obj, attrs, vid = self.__create_request(obj, attrs)
+        return self.operate_async(obj, attrs, "Screate",
+                                  lambda status: self.__create_response(obj, attrs, vid, status, do_assert),
+                                  vid, do_assert)
+
+    def __create_request(self, obj, attrs):
         vid = None
         if isinstance(obj, SaiObjType):
             vid = self.alloc_vid(obj)
@@ -168,9 +421,12 @@ class SaiRedisClient(SaiClient):
                 if type(attr) != str:
                     attrs[i] = json.dumps(attr)
             attrs = json.dumps(attrs)
+        return obj, attrs, vid
 
-        status = self.operate(obj, attrs, "Screate")
+    def __create_response(self, obj, attrs, vid, status, do_assert):
         status[2] = status[2].decode("utf-8")
+        if status[2] == 'SAI_STATUS_SUCCESS' and isinstance(vid, str):
+            self.vid_cache.setdefault(vid, None)
         if do_assert:
             assert status[2] == 'SAI_STATUS_SUCCESS', f"create({obj}, {attrs}) --> {status}"
             return vid
@@ -178,41 +434,79 @@ class SaiRedisClient(SaiClient):
         return status[2], vid
 
     def remove(self, obj, do_assert=True):
+        obj = self.__remove_request(obj)
+        status = self.operate(obj, "{}", "Dremove")
+        return self.__remove_response(obj, status, do_assert)
+
+    def remove_async(self, obj, do_assert=True):
+        obj = self.__remove_request(obj)
+        return self.operate_async(obj, "{}", "Dremove",
+                                  lambda status: self.__remove_response(obj, status, do_assert),
+                                  obj, do_assert)
+
+    def __remove_request(self, obj):
         if obj.startswith("oid:"):
-            assert self.vid_to_rid(obj), f"Unable to retrieve RID by VID {obj}"
+            self.__assert_vid_exists(obj)
             obj = self.vid_to_type(obj) + ":" + obj
         assert obj.startswith("SAI_OBJECT_TYPE_")
-        obj = obj.replace(" ", "")
+        return obj.replace(" ", "")
 
-        status = self.operate(obj, "{}", "Dremove")
+    def __remove_response(self, obj, status, do_assert):
+        self.vid_cache.pop(obj.split(":", 1)[1], None)
         status[2] = status[2].decode("utf-8")
         if do_assert:
             assert status[2] == 'SAI_STATUS_SUCCESS', f"remove({obj}) --> {status}"
         return status[2]
 
     def set(self, obj, attr, do_assert=True):
+        obj, attr = self.__set_request(obj, attr)
+        status = self.operate(obj, attr, "Sset")
+        return self.__set_response(obj, attr, status, do_assert)
+
+    def set_async(self, obj, attr, do_assert=True):
+        obj, attr = self.__set_request(obj, attr)
+        return self.operate_async(obj, attr, "Sset",
+                                  lambda status: self.__set_response(obj, attr, status, do_assert),
+                                  obj, do_assert)
+
+    def __set_request(self, obj, attr):
         if obj.startswith("oid:"):
-            assert self.vid_to_rid(obj), f"Unable to retrieve RID by VID {obj}"
+            self.__assert_vid_exists(obj)
             obj = self.vid_to_type(obj) + ":" + obj
         assert obj.startswith("SAI_OBJECT_TYPE_")
 
         if type(attr) != str:
             attr = json.dumps(attr)
-        status = self.operate(obj, attr, "Sset")
+        return obj, attr
+
+    def __set_response(self, obj, attr, status, do_assert):
         status[2] = status[2].decode("utf-8")
         if do_assert:
             assert status[2] == 'SAI_STATUS_SUCCESS', f"set({obj}, {attr}) --> {status}"
         return status[2]
 
     def get(self, obj, attrs, do_assert=True):
+        obj, attrs = self.__get_request(obj, attrs)
+        status = self.operate(obj, attrs, "Sget")
+        return self.__get_response(obj, attrs, status, do_assert)
+
+    def get_async(self, obj, attrs, do_assert=True):
+        obj, attrs = self.__get_request(obj, attrs)
+        return self.operate_async(obj, attrs, "Sget",
+                                  lambda status: self.__get_response(obj, attrs, status, do_assert),
+                                  obj, do_assert)
+
+    def __get_request(self, obj, attrs):
         if obj.startswith("oid:"):
-            assert self.vid_to_rid(obj), f"Unable to retrieve RID by VID {obj}"
+            self.__assert_vid_exists(obj)
             obj = self.vid_to_type(obj) + ":" + obj
         assert obj.startswith("SAI_OBJECT_TYPE_")
 
         if type(attrs) != str:
             attrs = json.dumps(attrs)
-        status = self.operate(obj, attrs, "Sget")
+        return obj, attrs
+
+    def __get_response(self, obj, attrs, status, do_assert):
         status[2] = status[2].decode("utf-8")
 
         if do_assert:
@@ -279,9 +573,7 @@ class SaiRedisClient(SaiClient):
         values = []
         for i in range(entries_num):
             if keys:
-                k = keys[i]
-                if type(k) != str:
-                    k = json.dumps(k).replace(" ", "")
+                k = self.__serialize_key(keys[i])
             else:
                 k = self.alloc_vid(obj_type)
             out_keys.append(k)
@@ -302,6 +594,10 @@ class SaiRedisClient(SaiClient):
 
         status[2] = status[2].decode("utf-8")
 
+        for k, entry in zip(out_keys, entry_status):
+            if entry == 'SAI_STATUS_SUCCESS' and k.startswith("oid:"):
+                self.vid_cache.setdefault(k, None)
+
         if do_assert:
             print(entry_status)
             assert status[2] == 'SAI_STATUS_SUCCESS'
@@ -343,11 +639,10 @@ class SaiRedisClient(SaiClient):
 
         values = []
         for i, _ in enumerate(keys):
-            k = keys[i]
-            if type(k) != str:
-                k = json.dumps(k).replace(" ", "")
+            k = self.__serialize_key(keys[i])
             values.append(k)
             values.append("")
+            self.vid_cache.pop(k, None)
 
         status = self.operate(key, json.dumps(values), "Dbulkremove")
 
@@ -415,9 +710,7 @@ class SaiRedisClient(SaiClient):
 
         values = []
         for i, _ in enumerate(keys):
-            k = keys[i]
-            if type(k) != str:
-                k = json.dumps(k).replace(" ", "")
+            k = self.__serialize_key(keys[i])
             values.append(k)
             if (len(attrs) > 1):
                 str_attr = self.__bulk_attr_serialize(attrs[i])
@@ -583,7 +876,7 @@ class SaiRedisClient(SaiClient):
            SAI_FDB_FLUSH_ATTR_BRIDGE_PORT_ID, and SAI_FDB_FLUSH_ATTR_BV_ID
         """
         if obj.startswith("oid:"):
-            assert self.vid_to_rid(obj), f"Unable to retrieve RID by VID {obj}"
+            self.__assert_vid_exists(obj)
             obj = self.vid_to_type(obj) + ":" + obj
         assert obj.startswith("SAI_OBJECT_TYPE_")
 
@@ -634,7 +927,7 @@ class SaiRedisClient(SaiClient):
         if obj_type is None:
             all_oids.sort()
             for idx, oid in enumerate(all_oids):
-                obj_type = SaiObjType(int(oid[4:], 16) >> 48)
+                obj_type = SaiObjType.from_vid(oid)
                 if obj_type.name not in oids_by_type:
                     oids_by_type[obj_type.name] = list()
                 oids_by_type[obj_type.name].append(oid)
@@ -642,41 +935,72 @@ class SaiRedisClient(SaiClient):
             return oids_by_type
 
         for oid in all_oids:
-            if obj_type == SaiObjType(int(oid[4:], 16) >> 48):
+            if obj_type == SaiObjType.from_vid(oid):
                 oids.append(oid)
         oids.sort()
         oids_by_type[obj_type.name] = oids
         return oids_by_type
 
+    def get_asic_state(self):
+        keys = [key.decode("utf-8") for key in self.r.keys("ASIC_STATE:*")]
+        with self.r.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            values = pipe.execute()
+        self.rpc_stats["round_trips"] += 2
+
+        state = {}
+        for key, attrs in zip(keys, values):
+            # The object with no attributes is stored as { "NULL": "NULL" }
+            state[key[len("ASIC_STATE:"):]] = {
+                k.decode("utf-8"): v.decode("utf-8") for k, v in attrs.items() if k != b"NULL"
+            }
+        return state
+
     def alloc_vid(self, obj_type):
         if isinstance(obj_type, str) and obj_type.startswith("SAI_OBJECT_TYPE_"):
-            obj_type = SaiObjType[obj_type.replace("SAI_OBJECT_TYPE_", "")]
+            obj_type = SaiObjType.from_name(obj_type)
         assert isinstance(obj_type, SaiObjType)
 
         vid = None
         if obj_type == SaiObjType.SWITCH:
+            self.rpc_stats["round_trips"] += 1
             if self.r.get("VIDCOUNTER") is None:
                 self.r.set("VIDCOUNTER", 0)
+                self.rpc_stats["round_trips"] += 1
                 vid = 0
         if vid is None:
             vid = self.r.incr("VIDCOUNTER")
+            self.rpc_stats["round_trips"] += 1
         return "oid:" + hex((obj_type.value << 48) | vid)
 
     def vid_to_rid(self, vid):
         assert vid.startswith("oid:"), f"Invalid VID format {vid}"
+        rid = self.vid_cache.get(vid)
+        if rid is not None:
+            return rid
         rid = self.r.hget("VIDTORID", vid)
+        self.rpc_stats["round_trips"] += 1
         if rid is not None:
             rid = rid.decode("utf-8")
             assert rid.startswith("oid:"), f"Invalid RID format {vid}"
+            self.vid_cache[vid] = rid
         return rid
 
+    def __assert_vid_exists(self, vid):
+        if self.skip_vid_check or vid in self.vid_cache:
+            return
+        assert self.vid_to_rid(vid), f"Unable to retrieve RID by VID {vid}"
+
     def __check_syncd_running(self):
         if self.asic_db == 1:
             numsub = self.r.execute_command('PUBSUB', 'NUMSUB', 'ASIC_STATE_CHANNEL')
+            self.rpc_stats["round_trips"] += 1
             if numsub[1] >= 1:
                 # SONiC 202111 or older detected
                 return "ASIC_STATE_CHANNEL"
         numsub = self.r.execute_command('PUBSUB', 'NUMSUB', f'ASIC_STATE_CHANNEL@{self.asic_db}')
+        self.rpc_stats["round_trips"] += 1
         if numsub[1] >= 1:
             # SONiC 202205 or newer detected
             return f"ASIC_STATE_CHANNEL@{self.asic_db}"
@@ -728,6 +1052,6 @@ class SaiRedisClient(SaiClient):
         return data
 
     @staticmethod
+    @lru_cache(maxsize=65536)
     def vid_to_type(vid):
-        obj_type = int(vid[4:], 16) >> 48
-        return "SAI_OBJECT_TYPE_" + SaiObjType(obj_type).name
+        return "SAI_OBJECT_TYPE_" + SaiObjType.from_vid(vid).name
@@ -69,7 +69,7 @@ class SaiThriftClient(SaiClient):
         status, result = self._operate('create', attrs=attrs, obj_type=obj_type, key=key)
         if key is None and isinstance(result, int):
             if isinstance(obj_type, str):
-                obj_type = SaiObjType[obj_type.replace("SAI_OBJECT_TYPE_", "")]
+                obj_type = SaiObjType.from_name(obj_type)
             self.sai_type_map[result] = obj_type
 
         vid = None
@@ -134,7 +134,7 @@ class SaiThriftClient(SaiClient):
                 obj_type = self.sai_type_map.get(oid, None)
                 if obj_type is None:
                     # FIXME: Looks like self.thrift_client.sai_thrift_object_type_query() is broken for BMv2.
-                    obj_type = SaiObjType(self.thrift_client.sai_thrift_object_type_query(ThriftConverter.object_id(oid)))
+                    obj_type = SaiObjType.from_value(self.thrift_client.sai_thrift_object_type_query(ThriftConverter.object_id(oid)))
                 return obj_type
             except Exception as e:
                 raise Exception
@@ -233,6 +233,8 @@ class SaiThriftClient(SaiClient):
         return status, result
 
     def cleanup(self):
+        # Drop the error of the asynchronous operation submitted before the cleanup
+        self._async_error = None
         if self.thrift_transport:
             self.thrift_transport.close()
 
@@ -262,63 +264,65 @@ class SaiThriftClient(SaiClient):
         attr_kwargs = dict(ThriftConverter.convert_attributes_to_thrift(attrs)) if attrs else {}
         result = sai_adapter.sai_thrift_flush_fdb_entries(self.thrift_client, **attr_kwargs)
 
-    def bulk_create(self, obj_type, keys, attrs, obj_count=0, do_assert=True):
-        # TODO: Provide proper implementation once Thrift bulk API is available
-        out_keys = []
-        entries_num = len(keys) if keys else obj_count
-        statuses = [None] * entries_num
-
+    @staticmethod
+    def bulk_obj(obj_type, key):
+        """
+        Convert the bulk entry into the object accepted by create/remove/set:
+            (obj_type, None)           => "SAI_OBJECT_TYPE_PORT"
+            (obj_type, "oid:0x1")      => "oid:0x1"
+            (obj_type, {"bvid": ...})  => "SAI_OBJECT_TYPE_FDB_ENTRY:{\"bvid\": ...}"
+        """
+        if key is None:
+            return obj_type
+        if isinstance(key, str) and key.startswith("oid:"):
+            return key
+        if not isinstance(key, str):
+            key = json.dumps(key)
+        return obj_type + ":" + key
+
+    def _bulk_operate(self, operation, obj_type, keys, attrs, do_assert):
+        # Emulate SAI_BULK_OP_ERROR_MODE_STOP_ON_ERROR: the entries after the failed one are not executed
         if isinstance(obj_type, SaiObjType):
             obj_type = "SAI_OBJECT_TYPE_" + obj_type.name
 
-        for i in range(entries_num):
-            attr = attrs[0] if len(attrs) == 1 else attrs[i]
-            if do_assert == False:
-                status, vid = self.create(obj_type + ":" + json.dumps(keys[i]), attr, do_assert)
+        out_keys = []
+        statuses = []
+        for i, key in enumerate(keys):
+            if statuses and statuses[-1] != "SAI_STATUS_SUCCESS":
+                statuses.append("SAI_STATUS_NOT_EXECUTED")
+                out_keys.append(None)
+                continue
+            obj = self.bulk_obj(obj_type, key)
+            attr = None if attrs is None else (attrs[0] if len(attrs) == 1 else attrs[i])
+            if operation == "create":
+                status, vid = self.create(obj, attr, do_assert=False)
                 out_keys.append(vid)
-                statuses.append(status)
-                if status != "SAI_STATUS_SUCCESS":
-                    return "SAI_STATUS_FAILURE", out_keys, statuses
+            elif operation == "remove":
+                status = self.remove(obj, do_assert=False)
             else:
-                vid = self.create(obj_type + ":" + json.dumps(keys[i]), attr, do_assert)
-                out_keys.append(vid)
-                statuses.append("SAI_STATUS_SUCCESS")
-        return "SAI_STATUS_SUCCESS", out_keys, statuses
+                status = self.set(obj, attr, do_assert=False)
+            statuses.append(status)
+            if do_assert:
+                assert status == "SAI_STATUS_SUCCESS", f"bulk {operation}({obj}, {attr}) --> {status}"
 
-    def bulk_remove(self, obj_type, keys, do_assert=True):
-        # TODO: Provide proper implementation once Thrift bulk API is available
-        statuses = [None] * len(keys)
+        status = "SAI_STATUS_SUCCESS" if all(s == "SAI_STATUS_SUCCESS" for s in statuses) else "SAI_STATUS_FAILURE"
+        return status, out_keys, statuses
 
-        if isinstance(obj_type, SaiObjType):
-            obj_type = "SAI_OBJECT_TYPE_" + obj_type.name
+    def bulk_create(self, obj_type, keys, attrs, obj_count=0, do_assert=True):
+        # TODO: Provide proper implementation once Thrift bulk API is available
+        if keys is None:
+            keys = [None] * obj_count
+        return self._bulk_operate("create", obj_type, keys, attrs, do_assert)
 
-        for key in keys:
-            if do_assert == False:
-                status, _ = self.remove(obj_type + ":" + json.dumps(key), do_assert)
-                statuses.append(status)
-                if status != "SAI_STATUS_SUCCESS":
-                    return "SAI_STATUS_FAILURE", statuses
-            else:
-                self.remove(obj_type + ":" + json.dumps(key), do_assert)
-        return "SAI_STATUS_SUCCESS", statuses
+    def bulk_remove(self, obj_type, keys, do_assert=True):
+        # TODO: Provide proper implementation once Thrift bulk API is available
+        status, _, statuses = self._bulk_operate("remove", obj_type, keys, None, do_assert)
+        return status, statuses
 
     def bulk_set(self, obj_type, keys, attrs, do_assert=True):
         # TODO: Provide proper implementation once Thrift bulk API is available
-        statuses = [None] * len(keys)
-
-        if isinstance(obj_type, SaiObjType):
-            obj_type = "SAI_OBJECT_TYPE_" + obj_type.name
-
-        for i in range(len(keys)):
-            attr = attrs[0] if len(attrs) == 1 else attrs[i]
-            if do_assert == False:
-                status, _ = self.set(obj_type + ":" + json.dumps(keys[i]), attr, do_assert)
-                statuses.append(status)
-                if status != "SAI_STATUS_SUCCESS":
-                    return "SAI_STATUS_FAILURE", statuses
-            else:
-                self.set(obj_type + ":" + json.dumps(keys[i]), attr, do_assert)
-        return "SAI_STATUS_SUCCESS", statuses
+        status, _, statuses = self._bulk_operate("set", obj_type, keys, attrs, do_assert)
+        return status, statuses
 
     def get_stats(self, obj, attrs, do_assert=True):
         obj_type, oid, _ = self.obj_to_items(obj)
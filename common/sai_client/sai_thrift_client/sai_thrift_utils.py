@@ -1,3 +1,4 @@
+import os
 import re
 from itertools import zip_longest
 import ipaddress
@@ -9,6 +10,7 @@ from sai_thrift.sai_headers import *
 from sai_thrift.sai_adapter import *
 import sai_thrift.sai_adapter as adapter
 from saichallenger.common.sai_data import SaiObjType, SaiStatus
+from saichallenger.common.sai_meta import SaiMetadata, load_cached
 
 
 class ThriftConverter():
@@ -596,7 +598,7 @@ class ThriftConverter():
             except AttributeError:
                 return None
         elif isinstance(obj_type, int):
-            return SaiObjType(obj_type)
+            return SaiObjType.from_value(obj_type)
         return None
 
     @staticmethod
@@ -618,39 +620,23 @@ class ThriftConverter():
     @staticmethod
     def get_sai_meta(obj_type, attr_name):
         """Get SAI meta data by SAI object type and attribute name"""
-        try:
-            with open("/etc/sai/sai.json", "r") as f:
-                sai_json = json.loads(f.read())
-        except IOError:
+        meta = SaiMetadata.get()
+        if meta is None:
             return None
-
-        if isinstance(obj_type, SaiObjType):
-            obj_type = "SAI_OBJECT_TYPE_" + SaiObjType(obj_type).name
-        else:
-            assert isinstance(obj_type, str)
-            assert obj_type.startswith("SAI_OBJECT_TYPE_")
-
-        for item in sai_json:
-            if obj_type not in item.values(): continue
-            attrs = item.get('attributes')
-            for attr in attrs:
-                if attr_name == attr.get('name'):
-                    return attr
-        return None
+        return meta.get_attr(obj_type, attr_name)
 
     @staticmethod
     def get_str_by_enum(obj_type, attr_name, enum_value):
         """Get enum member str name by enum member value"""
-        meta = ThriftConverter.get_sai_meta(obj_type, attr_name)
+        meta = SaiMetadata.get()
         if meta is None:
             return None
-        if meta['properties'].get('values') is None:
+        attr = meta.get_attr(obj_type, attr_name)
+        if attr is None:
+            return None
+        if attr['properties'].get('values') is None:
             return str(enum_value)
-        for k, v in meta['properties']['values'].items():
-            if v == enum_value:
-                return k
-
-        return None
+        return meta.get_enum_name(obj_type, attr_name, enum_value)
 
     @staticmethod
     def get_enum_by_str(value):
@@ -662,7 +648,6 @@ class ThriftConverter():
     @staticmethod
     def get_generic_type(attr_name):
         """Get attribute generic type"""
-        obj_type = SaiObjType[attr_name.split("SAI_")[1].split("_ATTR")[0]]
         generic_types = {
             "bool"              : ( "bool",   None ),
             "sai_uint8_t"       : ( "u8",     "u16" ),
@@ -679,28 +664,34 @@ class ThriftConverter():
             "sai_object_list_t" : ( "objlist", None ),
             "sai_u8_list_t"     : ( "u8list", "u8list" ),
         }
-        meta = ThriftConverter.get_sai_meta(obj_type, attr_name)
-        if meta is None:
+        meta = SaiMetadata.get()
+        attr = meta.find_attr(attr_name) if meta is not None else None
+        if attr is None:
             return None
-        return generic_types[meta['properties'].get('genericType')]
+        return generic_types[attr['properties'].get('genericType')]
+
+    # E.g.: attrs["SAI_PORT_ATTR_TYPE"] = attr.value.s32
+    adapter_attr_pattern = re.compile(r'attrs\["(SAI_\w+)"\]\s*=\s*attr\.value\.(\w+)')
+    adapter_stamp = None
 
     @staticmethod
     def generate_metadata():
-        import subprocess
-        import glob
-
-        # Search for thrift adapter
-        sai_thrift_adapter = glob.glob("/usr/local/lib/**/sai_adapter.py", recursive=True)[0]
-
-        # Get attributes from thrift adapter
-        cmd = f"cat {sai_thrift_adapter}"
-        cmd += " | grep -e 'attrs\[\"SAI_.*'"
-        cmd += " | sed 's/ attrs\[//' "
-        cmd += " | sed 's/\] = attr\\.value\\./: \"/'"
-        cmd += " | sed 's/$/\",/'"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        assert result.returncode == 0, "Metadata generation failed!"
-
-        # Put attributes to dict
-        data = "{" + result.stdout[:-2] + "}"
-        ThriftConverter.sai_metadata = json.loads(data)
+        """
+        Generate the map of SAI attribute name to the attribute value field
+        of sai_thrift_attribute_value_t from the Thrift adapter code:
+        { "SAI_PORT_ATTR_TYPE": "s32", ... }
+        The map is regenerated only once the adapter is changed.
+        """
+        # Thrift adapter in use
+        sai_thrift_adapter = adapter.__file__
+        stamp = (sai_thrift_adapter, os.stat(sai_thrift_adapter).st_mtime_ns)
+        if stamp == ThriftConverter.adapter_stamp:
+            return
+
+        def build(content):
+            attrs = ThriftConverter.adapter_attr_pattern.findall(content.decode("utf-8"))
+            assert attrs, "Metadata generation failed!"
+            return dict(attrs)
+
+        ThriftConverter.sai_metadata = load_cached("sai_thrift_attrs", sai_thrift_adapter, build)
+        ThriftConverter.adapter_stamp = stamp
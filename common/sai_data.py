@@ -58,15 +58,72 @@ class SaiObjType(Enum):
         if list(SaiObjType):
             return
 
-        try:
-            with open("/etc/sai/sai.json", "r") as f:
-                sai_json = json.loads(f.read())
-        except IOError:
-            assert False, "Failed to locate `sai.json` file"
+        from saichallenger.common.sai_meta import SaiMetadata
+        meta = SaiMetadata.get()
+        assert meta is not None, "Failed to locate `sai.json` file"
 
-        for item in sai_json:
+        for item in meta.items:
             extend_enum(SaiObjType, item.get('name')[16:], item.get('value'))
 
+    @staticmethod
+    def from_value(value) -> 'SaiObjType':
+        """
+        Get SAI object type by value.
+        Unlike SaiObjType(value), it is a plain list lookup for the values that can be encoded into VID.
+
+        Raises:
+            ValueError: If the value is unknown
+        """
+        by_value = _obj_type_registry()[0]
+        if 0 <= value < len(by_value) and by_value[value] is not None:
+            return by_value[value]
+        return SaiObjType(value)
+
+    @staticmethod
+    def from_vid(vid) -> 'SaiObjType':
+        """
+        Decode SAI object type from VID:
+        "oid:0x1000000000001" => SaiObjType.PORT
+        """
+        return SaiObjType.from_value(int(vid[4:], 16) >> 48)
+
+    @staticmethod
+    def from_name(name) -> 'SaiObjType':
+        """
+        "SAI_OBJECT_TYPE_PORT" => SaiObjType.PORT
+        "PORT"                 => SaiObjType.PORT
+        """
+        obj_type = _obj_type_registry()[1].get(name)
+        if obj_type is None:
+            obj_type = SaiObjType[name[16:] if name.startswith("SAI_OBJECT_TYPE_") else name]
+        return obj_type
+
+
+# SAI object type value is encoded into VID bits 55..48
+_VID_OBJ_TYPE_MAX = 0xFF
+
+# SaiObjType registry: the list indexed by the object type value and the dictionary keyed by
+# the object type name. It is built on the first lookup and rebuilt once the enum is extended.
+_obj_types_by_value = []
+_obj_types_by_name = {}
+_obj_types_count = 0
+
+
+def _obj_type_registry():
+    global _obj_types_by_value, _obj_types_by_name, _obj_types_count
+
+    if _obj_types_count != len(SaiObjType):
+        by_value = [None] * (_VID_OBJ_TYPE_MAX + 1)
+        by_name = {}
+        for obj_type in SaiObjType:
+            if 0 <= obj_type.value <= _VID_OBJ_TYPE_MAX:
+                by_value[obj_type.value] = obj_type
+            by_name[obj_type.name] = obj_type
+            by_name["SAI_OBJECT_TYPE_" + obj_type.name] = obj_type
+        _obj_types_by_value, _obj_types_by_name = by_value, by_name
+        _obj_types_count = len(SaiObjType)
+    return _obj_types_by_value, _obj_types_by_name
+
 
 class SaiStatus(Enum):
     """
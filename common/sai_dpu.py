@@ -41,6 +41,9 @@ class SaiDpu(Sai):
             self.dot1q_br_oid = self.get(self.switch_oid,
                                          ["SAI_SWITCH_ATTR_DEFAULT_1Q_BRIDGE_ID", "oid:0x0"]).oid()
 
+        # The objects created by init() are not subject to teardown_all()
+        self.object_graph.clear()
+
     def cleanup(self):
         super().cleanup()
         self.port_oids.clear()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+# Bump the version on any change of the cached data layout
+CACHE_VERSION = 2
+CACHE_DIR = os.environ.get("SAI_METADATA_CACHE_DIR", os.path.expanduser("~/.cache/saichallenger"))
+
+
+def load_cached(name, path, build):
+    """
+    Return the data built from the file content, using the binary (pickle) cache.
+
+    The cache entry is keyed by the hash of the file content, so it is rebuilt
+    once the file changes. Failure to write the cache is not an error.
+
+    Args:
+        name: Cache entry name
+        path: Source file path
+        build: Function to build the data from the file content (bytes)
+
+    Raises:
+        OSError: If the source file is not available
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha1(content).hexdigest()
+    cache_file = os.path.join(CACHE_DIR, f"{name}-v{CACHE_VERSION}-{digest}.pickle")
+
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    data = build(content)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+    return data
+
+
+class SaiMetadata:
+    """
+    Indexed SAI metadata.
+
+    The SAI metadata (/etc/sai/sai.json) is the list of SAI object types
+    with their attributes. To avoid linear scans on every lookup, it is indexed
+    once at load time as: object type -> attribute name -> attribute properties.
+
+    Attributes:
+        items: The SAI metadata as it is defined in sai.json
+        types: Dictionary mapping object type name to its metadata
+        attrs: Dictionary mapping object type name to its attributes metadata,
+               ordered as in sai.json and keyed by attribute name
+        attr_index: Dictionary mapping attribute name to its metadata across all object types
+        oid_attrs: Dictionary mapping object type name to the set of its attributes
+                   that refer to other objects (object ID or object list)
+    """
+
+    OID_TYPES = ("sai_object_id_t", "sai_object_list_t")
+
+    PATH = "/etc/sai/sai.json"
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, items):
+        """
+        Initialize SaiMetadata.
+
+        Args:
+            items: The list of SAI object types metadata as defined in sai.json
+        """
+        self.items = items
+        self.types = {}
+        self.attrs = {}
+        self.attr_types = {}
+        self.attr_index = {}
+        self.enums = {}
+        self.enum_names = {}
+        self.flags = {}
+        self.oid_attrs = {}
+
+        for item in items:
+            obj_type = item["name"]
+            self.types[obj_type] = item
+            self.attrs[obj_type] = {attr["name"]: attr for attr in item.get("attributes", [])}
+            self.attr_types[obj_type] = [(attr["name"], attr["properties"]["type"])
+                                         for attr in item.get("attributes", [])]
+            self.oid_attrs[obj_type] = frozenset(
+                attr["name"] for attr in item.get("attributes", [])
+                if "objects" in attr["properties"] or
+                attr["properties"]["type"] in self.OID_TYPES or
+                attr["properties"].get("genericType") in self.OID_TYPES)
+            for attr in item.get("attributes", []):
+                self.attr_index.setdefault(attr["name"], attr)
+                properties = attr["properties"]
+                if properties.get("values") is not None:
+                    self.enums[(obj_type, attr["name"])] = properties["values"]
+                    names = {}
+                    for name, value in properties["values"].items():
+                        names.setdefault(value, name)
+                    self.enum_names[(obj_type, attr["name"])] = names
+                self.flags[(obj_type, attr["name"])] = frozenset(properties.get("flags", []))
+
+    @staticmethod
+    def get(path=PATH):
+        """
+        Return SAI metadata loaded from the path.
+        The metadata is loaded once per process and shared across all the users and threads.
+        Returns None if the metadata file is not available.
+        """
+        if SaiMetadata._instance is not None:
+            return SaiMetadata._instance
+        with SaiMetadata._lock:
+            if SaiMetadata._instance is None:
+                try:
+                    SaiMetadata._instance = load_cached("sai_meta", path,
+                                                        lambda content: SaiMetadata(json.loads(content)))
+                except IOError:
+                    return None
+        return SaiMetadata._instance
+
+    @staticmethod
+    def type_name(obj_type):
+        """
+        SaiObjType.PORT        => "SAI_OBJECT_TYPE_PORT"
+        "SAI_OBJECT_TYPE_PORT" => "SAI_OBJECT_TYPE_PORT"
+        """
+        if isinstance(obj_type, str):
+            assert obj_type.startswith("SAI_OBJECT_TYPE_")
+            return obj_type
+        return "SAI_OBJECT_TYPE_" + obj_type.name
+
+    def get_type(self, obj_type):
+        """Get SAI object type metadata"""
+        return self.types.get(self.type_name(obj_type))
+
+    def get_attrs(self, obj_type):
+        """Get the list of (attribute name, attribute type) for SAI object type"""
+        return self.attr_types.get(self.type_name(obj_type), [])
+
+    def get_oid_attrs(self, obj_type):
+        """Get the set of the attributes of SAI object type that refer to other objects"""
+        return self.oid_attrs.get(self.type_name(obj_type), frozenset())
+
+    def get_attr(self, obj_type, attr_name):
+        """Get SAI attribute metadata by SAI object type and attribute name"""
+        return self.attrs.get(self.type_name(obj_type), {}).get(attr_name)
+
+    def find_attr(self, attr_name):
+        """Get SAI attribute metadata by attribute name regardless of SAI object type"""
+        return self.attr_index.get(attr_name)
+
+    def get_attr_type(self, obj_type, attr_name):
+        """Get SAI attribute type, e.g. "sai_object_id_t" """
+        attr = self.get_attr(obj_type, attr_name)
+        if attr is None:
+            return None
+        return attr["properties"]["type"]
+
+    def get_attr_flags(self, obj_type, attr_name):
+        """Get SAI attribute flags, e.g. {"CREATE_AND_SET"}"""
+        return self.flags.get((self.type_name(obj_type), attr_name), frozenset())
+
+    def get_enum_values(self, obj_type, attr_name):
+        """Get enum members of SAI attribute as a dictionary: name -> value"""
+        return self.enums.get((self.type_name(obj_type), attr_name))
+
+    def get_enum_name(self, obj_type, attr_name, value):
+        """Get enum member name of SAI attribute by enum member value"""
+        return self.enum_names.get((self.type_name(obj_type), attr_name), {}).get(value)
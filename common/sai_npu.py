@@ -14,6 +14,10 @@ class SaiNpu(Sai):
     network forwarding elements like FDB entries, VLAN members, and routes.
     """
 
+    snapshot_fields = Sai.snapshot_fields + [
+        "dot1q_br_oid", "default_vlan_oid", "default_vlan_id", "default_vrf_oid", "port_oids", "dot1q_bp_oids"
+    ]
+
     def __init__(self, cfg):
         cfg["client"]["config"]["asic_type"] = "npu"
         super().__init__(cfg)
@@ -29,6 +33,11 @@ class SaiNpu(Sai):
         self.port_map = None
         self.hostif_map = None
         self.sku_config = None
+        # VLAN membership index: VLAN OID -> { bridge port OID -> VLAN member OID }.
+        # The VLAN is loaded from the switch on the first query.
+        self.vlan_members = {}
+        # VLAN member OID -> (VLAN OID, bridge port OID)
+        self.vlan_member_keys = {}
 
     def get_switch_id(self):
         return self.switch_oid
@@ -78,10 +87,7 @@ class SaiNpu(Sai):
             if self.sku_config is None:
                 # The ports will not be re-created.
                 # Make sure the bridge ports are added into the default VLAN.
-                for bp_oid in self.dot1q_bp_oids:
-                    vlan_mbr_oid = self.get_vlan_member(self.default_vlan_oid, bp_oid)
-                    if vlan_mbr_oid is None:
-                        self.create_vlan_member(self.default_vlan_oid, bp_oid, "SAI_VLAN_TAGGING_MODE_UNTAGGED")
+                self.add_default_vlan_members(self.dot1q_bp_oids)
 
         # Update SKU
         if self.sku_config is not None:
@@ -90,15 +96,118 @@ class SaiNpu(Sai):
         # Wait for ports oper up state
         if self.run_traffic:
             cpu_port_oid = self.get(self.switch_oid, ["SAI_SWITCH_ATTR_CPU_PORT"]).oid()
+            up_port_oids = []
             for port_oid in self.port_oids:
                 admin_state = self.get(port_oid, ["SAI_PORT_ATTR_ADMIN_STATE"]).value()
                 if port_oid != cpu_port_oid and admin_state == "true":
-                    self.assert_port_oper_up(port_oid)
+                    up_port_oids.append(port_oid)
+            self.assert_ports_oper_up(up_port_oids)
+
+        # The objects created by init() are not subject to teardown_all()
+        self.object_graph.clear()
+
+        # Post-init state to be restored by soft_reset()
+        self.capture_init_snapshot()
 
     def cleanup(self):
         super().cleanup()
         self.port_oids.clear()
         self.dot1q_bp_oids.clear()
+        self.invalidate_vlan_members()
+
+    def restore(self, snapshot):
+        super().restore(snapshot)
+        self.invalidate_vlan_members()
+
+    # CRUD with VLAN membership index update
+    def create(self, obj, attrs=[], do_assert=True):
+        obj_type = self.__obj_type_name(obj)
+        if obj_type == "SAI_OBJECT_TYPE_VLAN_MEMBER":
+            attr_map = dict(zip(attrs[::2], attrs[1::2]))
+        result = super().create(obj, attrs, do_assert)
+        status, oid = ("SAI_STATUS_SUCCESS", result) if do_assert else result
+        if status == "SAI_STATUS_SUCCESS":
+            if obj_type == "SAI_OBJECT_TYPE_VLAN_MEMBER":
+                self.__index_vlan_member(oid, attr_map)
+            elif obj_type == "SAI_OBJECT_TYPE_BRIDGE_PORT":
+                # Bridge port might be added into the default VLAN implicitly
+                self.invalidate_vlan_members()
+        return result
+
+    def remove(self, obj, do_assert=True):
+        result = super().remove(obj, do_assert)
+        if result == "SAI_STATUS_SUCCESS" or do_assert:
+            self.__unindex(obj)
+        return result
+
+    def bulk_create(self, obj_type, keys, attrs, obj_count=0, do_assert=True):
+        result = super().bulk_create(obj_type, keys, attrs, obj_count, do_assert)
+        obj_type = self.__obj_type_name(obj_type)
+        if obj_type == "SAI_OBJECT_TYPE_VLAN_MEMBER":
+            _, oids, statuses = result
+            for idx, (oid, status) in enumerate(zip(oids, statuses)):
+                if status == "SAI_STATUS_SUCCESS":
+                    attr = attrs[0] if len(attrs) == 1 else attrs[idx]
+                    self.__index_vlan_member(oid, dict(zip(attr[::2], attr[1::2])))
+        elif obj_type == "SAI_OBJECT_TYPE_BRIDGE_PORT":
+            self.invalidate_vlan_members()
+        return result
+
+    def bulk_remove(self, obj_type, keys, do_assert=True):
+        result = super().bulk_remove(obj_type, keys, do_assert)
+        _, statuses = result
+        for key, status in zip(keys, statuses):
+            if status == "SAI_STATUS_SUCCESS" and isinstance(key, str):
+                self.__unindex(key)
+        return result
+
+    def create_async(self, obj, attrs=[], do_assert=True):
+        if self.__obj_type_name(obj) in ["SAI_OBJECT_TYPE_VLAN_MEMBER", "SAI_OBJECT_TYPE_BRIDGE_PORT"]:
+            self.invalidate_vlan_members()
+        return super().create_async(obj, attrs, do_assert)
+
+    def remove_async(self, obj, do_assert=True):
+        self.invalidate_vlan_members()
+        return super().remove_async(obj, do_assert)
+
+    def invalidate_vlan_members(self):
+        """
+        Drop VLAN membership index. The VLANs will be re-loaded from the switch on demand.
+        Must be called if VLAN members are created/removed bypassing SaiNpu (e.g. through sai_client).
+        """
+        self.vlan_members = {}
+        self.vlan_member_keys = {}
+
+    @staticmethod
+    def __obj_type_name(obj):
+        if isinstance(obj, SaiObjType):
+            return "SAI_OBJECT_TYPE_" + obj.name
+        if isinstance(obj, str) and obj.startswith("SAI_OBJECT_TYPE_"):
+            return obj.split(":", 1)[0]
+        return None
+
+    def __index_vlan_member(self, oid, attr_map):
+        vlan_oid = attr_map.get("SAI_VLAN_MEMBER_ATTR_VLAN_ID")
+        bp_oid = attr_map.get("SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID")
+        if vlan_oid not in self.vlan_members:
+            # The VLAN will be loaded along with the new member
+            return
+        self.vlan_members[vlan_oid][bp_oid] = oid
+        self.vlan_member_keys[oid] = (vlan_oid, bp_oid)
+
+    def __unindex(self, obj):
+        oid = obj.split(":", 1)[1] if obj.startswith("SAI_OBJECT_TYPE_") else obj
+        if not oid.startswith("oid:"):
+            return
+        if oid in self.vlan_member_keys:
+            vlan_oid, bp_oid = self.vlan_member_keys.pop(oid)
+            self.vlan_members[vlan_oid].pop(bp_oid, None)
+        elif oid in self.vlan_members:
+            for mbr_oid in self.vlan_members.pop(oid).values():
+                self.vlan_member_keys.pop(mbr_oid, None)
+        elif any(oid in members for members in self.vlan_members.values()):
+            # The bridge port is removed. Its VLAN members might be removed implicitly.
+            self.invalidate_vlan_members()
 
     def reset(self):
         self.cleanup()
@@ -139,13 +248,38 @@ class SaiNpu(Sai):
                     ])
         return oid
 
+    def get_vlan_members(self, vlan_oid, refresh=False):
+        """
+        Get the VLAN members as a dictionary: bridge port OID -> VLAN member OID.
+        The VLAN members are read from the switch only on the first query of the VLAN
+        or if refresh is requested. Otherwise, they are served from the index.
+        """
+        if refresh or vlan_oid not in self.vlan_members:
+            for mbr_oid in self.vlan_members.pop(vlan_oid, {}).values():
+                self.vlan_member_keys.pop(mbr_oid, None)
+            members = {}
+            for vlan_mbr_oid in self.get(vlan_oid, ["SAI_VLAN_ATTR_MEMBER_LIST"]).to_list():
+                bp_oid = self.get(vlan_mbr_oid, ["SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID"]).oid()
+                members[bp_oid] = vlan_mbr_oid
+                self.vlan_member_keys[vlan_mbr_oid] = (vlan_oid, bp_oid)
+            self.vlan_members[vlan_oid] = members
+        return dict(self.vlan_members[vlan_oid])
+
+    def add_default_vlan_members(self, bp_oids):
+        """Add the bridge ports that are not the default VLAN members yet into the default VLAN as untagged"""
+        members = self.get_vlan_members(self.default_vlan_oid)
+        attrs = []
+        for bp_oid in bp_oids:
+            if bp_oid not in members:
+                attrs.append([
+                    "SAI_VLAN_MEMBER_ATTR_VLAN_ID",           self.default_vlan_oid,
+                    "SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID",    bp_oid,
+                    "SAI_VLAN_MEMBER_ATTR_VLAN_TAGGING_MODE", "SAI_VLAN_TAGGING_MODE_UNTAGGED"
+                ])
+        self.bulk_create_oids(SaiObjType.VLAN_MEMBER, attrs)
+
     def get_vlan_member(self, vlan_oid, bp_oid):
-        vlan_mbr_oids = self.get(vlan_oid, ["SAI_VLAN_ATTR_MEMBER_LIST"]).to_list()
-        for vlan_mbr_oid in vlan_mbr_oids:
-            oid = self.get(vlan_mbr_oid, ["SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID"]).oid()
-            if oid == bp_oid:
-                return vlan_mbr_oid
-        return None
+        return self.get_vlan_members(vlan_oid).get(bp_oid)
 
     def remove_vlan_member(self, vlan_oid, bp_oid):
         vlan_mbr_oid = self.get_vlan_member(vlan_oid, bp_oid)
@@ -211,21 +345,25 @@ class SaiNpu(Sai):
             self.port_map = None
 
     def set_sku_mode(self, sku):
-        # Remove existing ports
-        num_ports = len(self.dot1q_bp_oids)
-        for idx in range(num_ports):
-            oid =  self.get_vlan_member(self.default_vlan_oid, self.dot1q_bp_oids[idx])
-            if oid:
-                self.remove(oid)
-            self.remove(self.dot1q_bp_oids[idx])
-            status, data = self.get(self.port_oids[idx], ["SAI_PORT_ATTR_PORT_SERDES_ID"], do_assert=False)
+        # Collect the objects to remove
+        bp_to_member = self.get_vlan_members(self.default_vlan_oid)
+        vlan_mbr_oids = [bp_to_member[bp_oid] for bp_oid in self.dot1q_bp_oids if bp_oid in bp_to_member]
+        serdes_oids = []
+        for port_oid in self.port_oids[:len(self.dot1q_bp_oids)]:
+            status, data = self.get(port_oid, ["SAI_PORT_ATTR_PORT_SERDES_ID"], do_assert=False)
             if status == "SAI_STATUS_SUCCESS" and data.oid() != "oid:0x0":
-                self.remove(data.oid())
-            self.remove(self.port_oids[idx])
+                serdes_oids.append(data.oid())
+
+        # Remove existing ports, dependent objects first
+        self.bulk_remove_objects(SaiObjType.VLAN_MEMBER, vlan_mbr_oids)
+        self.bulk_remove_objects(SaiObjType.BRIDGE_PORT, self.dot1q_bp_oids)
+        self.bulk_remove_objects(SaiObjType.PORT_SERDES, serdes_oids)
+        self.bulk_remove_objects(SaiObjType.PORT, self.port_oids[:len(self.dot1q_bp_oids)])
         self.port_oids.clear()
         self.dot1q_bp_oids.clear()
 
         # Create ports as per SKU
+        ports_attrs = []
         for port in sku["port"]:
             port_attr = [
                 "SAI_PORT_ATTR_ADMIN_STATE",   "true",
@@ -253,41 +391,60 @@ class SaiNpu(Sai):
             fec = port["fec"] if "fec" in port else sku.get("fec", "none")
             port_attr.extend(["SAI_PORT_ATTR_FEC_MODE", "SAI_PORT_FEC_MODE_" + fec.upper()])
 
-            port_oid = self.create(SaiObjType.PORT, port_attr)
-            self.port_oids.append(port_oid)
+            ports_attrs.append(port_attr)
+        self.port_oids.extend(self.bulk_create_oids(SaiObjType.PORT, ports_attrs))
 
         # To make saivs happy on ports re-creation
         # This will cause refresh_port_list() to update READ_ONLY attribute
         # which is needed for refresh_bridge_port_list()
         self.get(self.switch_oid, ["SAI_SWITCH_ATTR_PORT_LIST"])
 
-        # Create bridge ports and default VLAN members
+        # Create bridge ports
+        bps_attrs = []
         for port_oid in self.port_oids:
-            bp_oid = self.create(SaiObjType.BRIDGE_PORT,
-                                [
-                                    "SAI_BRIDGE_PORT_ATTR_TYPE", "SAI_BRIDGE_PORT_TYPE_PORT",
-                                    "SAI_BRIDGE_PORT_ATTR_PORT_ID", port_oid,
-                                    #"SAI_BRIDGE_PORT_ATTR_BRIDGE_ID", self.dot1q_br_oid,
-                                    "SAI_BRIDGE_PORT_ATTR_ADMIN_STATE", "true"
-                                ])
-            self.dot1q_bp_oids.append(bp_oid)
-
-        # Check whether bridge ports were added into the default VLAN implicitly
-        default_vlan_bp = []
-        vlan_mbr_oids = self.get(self.default_vlan_oid, ["SAI_VLAN_ATTR_MEMBER_LIST"]).to_list()
-        for vlan_mbr_oid in vlan_mbr_oids:
-            oid = self.get(vlan_mbr_oid, ["SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID"]).oid()
-            default_vlan_bp.append(oid)
-
-        for oid in self.dot1q_bp_oids:
-            if oid not in default_vlan_bp:
-                self.create_vlan_member(self.default_vlan_oid, oid, "SAI_VLAN_TAGGING_MODE_UNTAGGED")
+            bps_attrs.append([
+                "SAI_BRIDGE_PORT_ATTR_TYPE", "SAI_BRIDGE_PORT_TYPE_PORT",
+                "SAI_BRIDGE_PORT_ATTR_PORT_ID", port_oid,
+                #"SAI_BRIDGE_PORT_ATTR_BRIDGE_ID", self.dot1q_br_oid,
+                "SAI_BRIDGE_PORT_ATTR_ADMIN_STATE", "true"
+            ])
+        self.dot1q_bp_oids.extend(self.bulk_create_oids(SaiObjType.BRIDGE_PORT, bps_attrs))
+
+        # Add bridge ports into the default VLAN unless they were added implicitly
+        self.add_default_vlan_members(self.dot1q_bp_oids)
 
     def assert_port_oper_up(self, port_oid, tout=15):
-        for i in range(tout):
-            data = self.get(port_oid, ["SAI_PORT_ATTR_OPER_STATUS"])
-            if data.value() == "SAI_PORT_OPER_STATUS_UP":
-                return
-            if i + 1 < tout:
-                time.sleep(1)
-        assert False, f"The port {port_oid} is still down after {tout} seconds..."
+        self.assert_ports_oper_up([port_oid], tout)
+
+    def assert_ports_oper_up(self, port_oids, tout=15):
+        """
+        Wait for all the ports to become oper up.
+
+        The ports are polled together within one loop that shares the deadline,
+        so the total wait is bounded by tout regardless of the number of ports.
+        Each poll reads the states of all the pending ports in one round:
+        the requests are submitted without waiting for each individual response (see get_async()).
+        The poll interval starts at 100ms and is doubled up to 1s.
+
+        Args:
+            port_oids: List of the port OIDs
+            tout: Timeout in seconds
+
+        Raises:
+            AssertionError: If some of the ports are still down after tout seconds
+        """
+        deadline = time.monotonic() + tout
+        delay = 0.1
+        pending = list(port_oids)
+        while pending:
+            futures = [self.get_async(port_oid, ["SAI_PORT_ATTR_OPER_STATUS", ""]) for port_oid in pending]
+            self.flush()
+            pending = [port_oid for port_oid, future in zip(pending, futures)
+                       if future.result().value() != "SAI_PORT_OPER_STATUS_UP"]
+            remaining = deadline - time.monotonic()
+            if not pending or remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1)
+        assert not pending, \
+            f"{len(pending)} of {len(port_oids)} ports are still down after {tout} seconds: {', '.join(pending)}"
@@ -0,0 +1,194 @@
+import copy
+import json
+import re
+
+from saichallenger.common.sai_meta import SaiMetadata
+
+OID_PATTERN = re.compile(r"oid:0x[0-9a-fA-F]+")
+
+
+def dependency_levels(depends_on):
+    """
+    Split the objects into the levels to be removed level by level.
+    An object is removed only after all the objects that refer to it.
+
+    Args:
+        depends_on: Dictionary mapping the object to the list of the objects it refers to
+
+    Returns:
+        List of the levels, each level is the list of the objects
+
+    Raises:
+        AssertionError: If the dependencies can not be resolved
+    """
+    # The number of the objects referring to the object
+    refcount = dict.fromkeys(depends_on, 0)
+    for deps in depends_on.values():
+        for dep in deps:
+            refcount[dep] += 1
+
+    levels = []
+    level = [obj for obj, count in refcount.items() if count == 0]
+    while level:
+        levels.append(level)
+        next_level = []
+        for obj in level:
+            for dep in depends_on[obj]:
+                refcount[dep] -= 1
+                if refcount[dep] == 0:
+                    next_level.append(dep)
+        level = next_level
+
+    assert sum(map(len, levels)) == len(depends_on), "Failed to resolve the dependencies of the objects to remove"
+    return levels
+
+
+class SaiObjectGraph:
+    """
+    Dependency graph of the SAI objects created through the Sai instance.
+
+    Each object is identified by its OID ("oid:0x...") or, for the key-based objects,
+    by "SAI_OBJECT_TYPE_XXX:{key}". For each object, the graph holds the OIDs
+    the object refers to through its key and through its object ID/list typed attributes
+    (as defined by SAI metadata). So, the objects can be removed in the correct order.
+
+    The graph is updated lazily: add()/set()/remove() only log the update, and the log is applied
+    (with the metadata lookup and the key normalization) on the first access to the graph nodes,
+    or once it reaches MAX_PENDING updates. So, the SAI operations do not wait for the graph
+    update, while the memory usage is bounded by the number of the live objects.
+
+    Attributes:
+        nodes: Dictionary mapping object ID to (object type, { attribute name -> referenced OIDs }).
+               The references from the key are stored under None attribute name.
+    """
+
+    # The max number of the logged updates
+    MAX_PENDING = 1024
+
+    def __init__(self):
+        self._nodes = {}
+        self._pending = []
+
+    @property
+    def nodes(self):
+        if self._pending:
+            self.__apply_pending()
+        return self._nodes
+
+    def __apply_pending(self):
+        pending, self._pending = self._pending, []
+        for update in pending:
+            update[0](*update[1:])
+
+    def __log(self, update):
+        self._pending.append(update)
+        if len(self._pending) >= self.MAX_PENDING:
+            self.__apply_pending()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, obj_id):
+        return obj_id in self.nodes
+
+    def copy(self):
+        graph = SaiObjectGraph()
+        graph._nodes = copy.deepcopy(self.nodes)
+        return graph
+
+    def clear(self):
+        self._nodes = {}
+        self._pending = []
+
+    @staticmethod
+    def object_id(obj_type, key):
+        """
+        Get the graph object ID:
+            (any type, "oid:0x1")                         => "oid:0x1"
+            ("SAI_OBJECT_TYPE_FDB_ENTRY", {...} or "{...}") => "SAI_OBJECT_TYPE_FDB_ENTRY:{...}"
+        The key is normalized, so the same object is identified the same way regardless of the key formatting.
+        """
+        if isinstance(key, str) and key.startswith("oid:"):
+            return key
+        if isinstance(key, str):
+            key = json.loads(key)
+        return obj_type + ":" + json.dumps(key, sort_keys=True, separators=(",", ":"))
+
+    @staticmethod
+    def attr_references(obj_type, attrs):
+        """
+        Return the dictionary: attribute name -> set of the OIDs the attribute refers to.
+        If SAI metadata is not available, all the attributes are checked for OIDs.
+        """
+        meta = SaiMetadata.get()
+        oid_attrs = meta.get_oid_attrs(obj_type) if meta else None
+        refs = {}
+        for name, value in zip(attrs[::2], attrs[1::2]):
+            if oid_attrs is not None and name not in oid_attrs:
+                continue
+            if not isinstance(value, str):
+                value = json.dumps(value)
+            oids = {oid for oid in OID_PATTERN.findall(value) if oid != "oid:0x0"}
+            if oids:
+                refs[name] = oids
+        return refs
+
+    def add(self, obj_type, key, attrs):
+        """
+        Add the created object.
+
+        Args:
+            obj_type: SAI object type name, e.g. "SAI_OBJECT_TYPE_VLAN"
+            key: OID or key of the object
+            attrs: List of the object's attributes: [attr1, val1, attr2, val2, ...]
+        """
+        # The caller may modify the key and the attributes after the call
+        if isinstance(key, dict):
+            key = copy.deepcopy(key)
+        self.__log((self._add, obj_type, key, list(attrs) if attrs else []))
+
+    def set(self, obj_type, key, attr):
+        """Update the object's references on the attribute set"""
+        if isinstance(key, dict):
+            key = copy.deepcopy(key)
+        self.__log((self._set, obj_type, key, list(attr)))
+
+    def remove(self, obj_type, key):
+        self.__log((self._remove, obj_type, key))
+
+    def _add(self, obj_type, key, attrs):
+        obj_id = self.object_id(obj_type, key)
+        refs = self.attr_references(obj_type, attrs or [])
+        if not obj_id.startswith("oid:"):
+            key_refs = set(OID_PATTERN.findall(obj_id.split(":", 1)[1])) - {"oid:0x0"}
+            if key_refs:
+                refs[None] = key_refs
+        self._nodes[obj_id] = (obj_type, refs)
+
+    def _set(self, obj_type, key, attr):
+        node = self._nodes.get(self.object_id(obj_type, key))
+        if node is None:
+            return
+        refs = node[1]
+        refs.pop(attr[0], None)
+        refs.update(self.attr_references(node[0], attr))
+
+    def _remove(self, obj_type, key):
+        self._nodes.pop(self.object_id(obj_type, key), None)
+
+    def removal_levels(self):
+        """
+        Split the objects into the levels to be removed level by level (see dependency_levels()).
+
+        Returns:
+            List of the levels, each level is the list of the object IDs
+        """
+        depends_on = {}
+        for obj_id, (_, refs) in self.nodes.items():
+            deps = set().union(*refs.values()) if refs else set()
+            deps.discard(obj_id)
+            depends_on[obj_id] = [dep for dep in deps if dep in self.nodes]
+        return dependency_levels(depends_on)
+
+    def obj_type(self, obj_id):
+        return self.nodes[obj_id][0]
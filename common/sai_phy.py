@@ -46,6 +46,9 @@ class SaiPhy(Sai):
             self.port_oids = self.get(self.switch_oid,
                                      ["SAI_SWITCH_ATTR_PORT_LIST", self.make_list(port_num, "oid:0x0")]).oids()
 
+        # The objects created by init() are not subject to teardown_all()
+        self.object_graph.clear()
+
     def set_sku_mode(self, sku):
         port_map = dict()
         for port in sku["port"]:
@@ -0,0 +1,331 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from saichallenger.common.sai_object_graph import OID_PATTERN
+
+# The actions Sai.apply_rec() replays
+REC_ACTIONS = frozenset("cCsSrRgGE")
+
+
+def rotated_files(fname):
+    """
+    Get the rotated sairedis.rec files in the order of the records, from the oldest to the newest:
+        sairedis.rec.N.gz, ..., sairedis.rec.2.gz, sairedis.rec.1, sairedis.rec
+    """
+    files = []
+    idx = 1
+    while True:
+        rotated = [name for name in (f"{fname}.{idx}", f"{fname}.{idx}.gz") if os.path.exists(name)]
+        if not rotated:
+            break
+        files.append(rotated[0])
+        idx += 1
+    files.reverse()
+    if os.path.exists(fname):
+        files.append(fname)
+    return files
+
+
+def open_rec(fname):
+    """Open sairedis.rec file for reading. The gzip compressed file is detected by its content."""
+    with open(fname, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    if compressed:
+        return gzip.open(fname, "rt")
+    return open(fname, "r")
+
+
+def read_rec(fnames):
+    """
+    Read the lines of sairedis.rec file(s) one by one.
+
+    Args:
+        fnames: File name, or list of the file names to be read one after another (see rotated_files())
+
+    Yields:
+        (line number, line). The lines are numbered through all the files.
+    """
+    if isinstance(fnames, str):
+        fnames = [fnames]
+    cnt = 0
+    for fname in fnames:
+        with open_rec(fname) as fp:
+            for line in fp:
+                cnt += 1
+                yield cnt, line
+
+
+def parse_record(line):
+    '''
+    Non-bulk entry format:
+    data|action|sai-object-type:key|attr1|attr2
+
+    Will be converted into:
+    [["action", "sai-object-type:key", "attr1", "attr2"]]
+
+    Bulk entry format:
+    data|action|sai-object-type||key1|attr1|attr2||...||key-n|attr1|attr2
+
+    Will be converted into:
+    [["action", "sai-object-type"], ["key", "attr1", "attr2"], ..., [key-n", "attr1", "attr2"]]
+    '''
+    data = []
+    bulk_tokens = line.strip().split("||")
+    for idx, token in enumerate(bulk_tokens):
+        tokens = token.strip().split("|")
+        if idx == 0:
+            tokens = tokens[1:]
+        data.append(tokens)
+    return data
+
+
+def parse_rec(lines, actions=REC_ACTIONS):
+    """
+    Tokenize sairedis.rec lines (see parse_record()).
+    The lines with the other actions, and the records that do not refer to SAI objects,
+    are skipped before the tokenization of the whole line.
+
+    Args:
+        lines: Iterable of (line number, line) (see read_rec())
+        actions: The actions of the records to be parsed
+
+    Yields:
+        (line number, timestamp, record). The timestamp is kept as recorded (see parse_timestamp()).
+    """
+    for cnt, line in lines:
+        # data|action|sai-object-type:key|...
+        fields = line.split("|", 3)
+        if len(fields) < 2 or fields[1] not in actions:
+            logging.debug("Ignored line {}: {}".format(cnt, line.strip()))
+            continue
+        if len(fields) > 2 and fields[2] and not fields[2].startswith("SAI_"):
+            logging.debug("Ignored line {}: {}".format(cnt, line.strip()))
+            continue
+        yield cnt, fields[0], parse_record(line)
+
+
+class OidRewriter:
+    """
+    Substitute the OIDs in a single pass over the value, with the compiled OID pattern
+    and the substitution from the mapping. The value can be:
+        scalar:      "oid:0x1"                       => "oid:0x2100000000"
+        object list: "2:oid:0x1,oid:0x2"             => "2:oid:0x2100000000,oid:0x2100000001"
+        entry key:   '{"bvid":"oid:0x1","mac":"..."}' => '{"bvid":"oid:0x2100000000","mac":"..."}'
+    The NULL object ID "oid:0x0" is kept as is.
+
+    Attributes:
+        mapping: Dictionary mapping the original OID to the new one, e.g. Sai.rec2vid
+        resolve: Optional callable invoked with the OID missing in the mapping,
+                 e.g. to complete the pending creation of the object
+    """
+
+    def __init__(self, mapping, resolve=None):
+        self.mapping = mapping
+        self.resolve = resolve
+
+    def __substitute(self, match):
+        oid = match.group(0)
+        if oid == "oid:0x0":
+            return oid
+        if oid not in self.mapping and self.resolve is not None:
+            self.resolve(oid)
+        assert oid in self.mapping, "Unknown OID {}".format(oid)
+        return self.mapping[oid]
+
+    def rewrite(self, value):
+        if "oid:" not in value:
+            return value
+        return OID_PATTERN.sub(self.__substitute, value)
+
+    def rewrite_attrs(self, attrs):
+        """Substitute the OIDs in the values of the attributes list: [attr1, val1, attr2, val2, ...]"""
+        for idx in range(1, len(attrs), 2):
+            attrs[idx] = self.rewrite(attrs[idx])
+        return attrs
+
+
+def percentile(values, pct):
+    """Get the percentile of the sorted values (nearest-rank method)"""
+    if not values:
+        return None
+    idx = max(0, -(-len(values) * pct // 100) - 1)
+    return values[min(int(idx), len(values) - 1)]
+
+
+def parse_timestamp(timestamp):
+    """
+    Convert sairedis.rec timestamp, e.g. "2017-05-25.00:52:12.223149", into seconds since the epoch.
+    Returns None if the timestamp can not be parsed.
+    """
+    try:
+        return datetime.strptime(timestamp, "%Y-%m-%d.%H:%M:%S.%f").timestamp()
+    except ValueError:
+        return None
+
+
+class SaiRecPacer:
+    """
+    Pace sairedis.rec replay according to the records' timestamps.
+
+    The records are scheduled at the original inter-arrival gaps divided by the speed:
+        speed=None - as fast as possible, the records are not delayed
+        speed=1    - real-time
+        speed=N    - N times faster than the original
+    In any mode, the lag of each record behind its schedule is measured when the record
+    is dispatched. As fast as possible replay is measured against the real-time schedule,
+    so the negative lag shows how far it is ahead of the original.
+    """
+
+    def __init__(self, speed=None):
+        assert speed is None or speed > 0, "Invalid replay speed {}".format(speed)
+        self.speed = speed
+        self.rec_start = None
+        self.start = None
+        self.last_scheduled = None
+        self.end = None
+        self.lags = []
+
+    def __scheduled(self, rec_time):
+        if self.rec_start is None:
+            self.rec_start = rec_time
+            self.start = time.monotonic()
+        return self.start + (rec_time - self.rec_start) / (self.speed or 1)
+
+    def wait(self, timestamp):
+        """
+        Wait for the record's scheduled time.
+
+        Args:
+            timestamp: The record's timestamp as recorded
+        """
+        rec_time = parse_timestamp(timestamp)
+        if rec_time is None:
+            return
+        scheduled = self.__scheduled(rec_time)
+        now = time.monotonic()
+        if self.speed is not None and now < scheduled:
+            time.sleep(scheduled - now)
+            now = time.monotonic()
+        self.lags.append(now - scheduled)
+        self.last_scheduled = scheduled
+
+    def finish(self):
+        """Mark the end of the replay"""
+        self.end = time.monotonic()
+
+    def summary(self):
+        """
+        Get the lag behind the schedule as JSON serializable dictionary. The times are in seconds.
+        The final lag is the time from the last record's scheduled time to the end of the replay.
+        """
+        end = self.end if self.end is not None else time.monotonic()
+        lags = sorted(self.lags)
+        return {
+            "mode": "afap" if self.speed is None else "real-time" if self.speed == 1 else "{}x".format(self.speed),
+            "records": len(lags),
+            "max_lag": lags[-1] if lags else None,
+            "avg_lag": sum(lags) / len(lags) if lags else None,
+            "p99_lag": percentile(lags, 99),
+            "final_lag": end - self.last_scheduled if self.last_scheduled is not None else None,
+        }
+
+
+class SaiRecStats:
+    """
+    Replay statistics of sairedis.rec records.
+
+    Per action and per object type, it collects the number of the records,
+    the number of the entries (objects within bulk records), the total time
+    and the latency of the records. The latency of the record is the time
+    Sai.apply_rec() spent on it. For the asynchronous and batched records,
+    that is the submission time, while the time spent waiting for the responses
+    is accounted to the final flush.
+
+    Attributes:
+        trace: Optional file object the per-record timing is written to as JSON lines
+    """
+
+    def __init__(self, trace=None):
+        self.trace = trace
+        self.actions = {}
+        self.obj_types = {}
+        self.bulk_sizes = []
+        self.flush_time = 0.0
+        self.start_time = time.perf_counter()
+        self.wall_time = None
+
+    def add(self, cnt, record, latency):
+        """
+        Account the replayed record.
+
+        Args:
+            cnt: Line number of the record
+            record: Parsed record (see parse_record())
+            latency: Time spent on the record, in seconds
+        """
+        action = record[0][0]
+        obj_type = record[0][1].split(":", 1)[0] if len(record[0]) > 1 else None
+        if obj_type is not None and not obj_type.startswith("SAI_OBJECT_TYPE_"):
+            # The responses ('G', 'E') hold the status instead
+            obj_type = None
+        # Bulk record holds the entries after the header
+        entries = len(record) - 1 if len(record) > 1 else 1
+        if len(record) > 1:
+            self.bulk_sizes.append(entries)
+
+        for group, name in ((self.actions, action), (self.obj_types, obj_type)):
+            if name is None:
+                continue
+            stats = group.setdefault(name, {"records": 0, "entries": 0, "latencies": []})
+            stats["records"] += 1
+            stats["entries"] += entries
+            stats["latencies"].append(latency)
+
+        if self.trace is not None:
+            self.trace.write(json.dumps({"line": cnt, "action": action, "obj_type": obj_type,
+                                         "entries": entries, "latency": latency}) + "\n")
+
+    def finish(self, flush_time):
+        """Account the final flush and stop the wall time"""
+        self.flush_time = flush_time
+        self.wall_time = time.perf_counter() - self.start_time
+
+    @staticmethod
+    def __group_summary(stats):
+        latencies = sorted(stats["latencies"])
+        return {
+            "records": stats["records"],
+            "entries": stats["entries"],
+            "time": sum(latencies),
+            "p50": percentile(latencies, 50),
+            "p99": percentile(latencies, 99),
+        }
+
+    def summary(self):
+        """
+        Get the statistics as JSON serializable dictionary. The times are in seconds.
+        """
+        records = sum(stats["records"] for stats in self.actions.values())
+        entries = sum(stats["entries"] for stats in self.actions.values())
+        wall_time = self.wall_time if self.wall_time is not None else time.perf_counter() - self.start_time
+        bulk_sizes = sorted(self.bulk_sizes)
+        return {
+            "records": records,
+            "entries": entries,
+            "wall_time": wall_time,
+            "flush_time": self.flush_time,
+            "entries_per_sec": entries / wall_time if wall_time else None,
+            "actions": {name: self.__group_summary(stats) for name, stats in self.actions.items()},
+            "object_types": {name: self.__group_summary(stats) for name, stats in self.obj_types.items()},
+            "bulk_sizes": {
+                "count": len(bulk_sizes),
+                "min": bulk_sizes[0] if bulk_sizes else None,
+                "max": bulk_sizes[-1] if bulk_sizes else None,
+                "avg": sum(bulk_sizes) / len(bulk_sizes) if bulk_sizes else None,
+                "p50": percentile(bulk_sizes, 50),
+            },
+        }
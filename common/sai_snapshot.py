@@ -0,0 +1,114 @@
+import copy
+
+from saichallenger.common.sai_object_graph import OID_PATTERN, dependency_levels
+
+
+class SaiAsicStateDiff:
+    """
+    Difference between the baseline ASIC state and the current one.
+
+    ASIC state is a dictionary: SAI object key -> dictionary of the attributes, e.g.:
+        {
+            "SAI_OBJECT_TYPE_VLAN:oid:0x26000000000001": { "SAI_VLAN_ATTR_VLAN_ID": "1" },
+            "SAI_OBJECT_TYPE_FDB_ENTRY:{\"bvid\":\"oid:0x26000000000001\",...}": { ... }
+        }
+
+    Attributes:
+        extra: The objects that are not in the baseline
+        missing: The objects that are only in the baseline
+        changed: The baseline objects' attributes with the values other than in the baseline:
+                 object key -> { attribute name -> baseline value }
+        added: The baseline objects' attributes that were not set in the baseline:
+               object key -> { attribute name -> current value }
+    """
+
+    def __init__(self, baseline, current):
+        self.extra = {key: attrs for key, attrs in current.items() if key not in baseline}
+        self.missing = {key: attrs for key, attrs in baseline.items() if key not in current}
+        self.changed = {}
+        self.added = {}
+
+        for key, attrs in baseline.items():
+            if key not in current or current[key] == attrs:
+                continue
+            changed = {name: value for name, value in attrs.items() if current[key].get(name) != value}
+            if changed:
+                self.changed[key] = changed
+            added = {name: value for name, value in current[key].items() if name not in attrs}
+            if added:
+                self.added[key] = added
+
+    def __bool__(self):
+        return bool(self.extra or self.missing or self.changed or self.added)
+
+    @staticmethod
+    def split_key(key):
+        """
+        "SAI_OBJECT_TYPE_VLAN:oid:0x26000000000001" => ("SAI_OBJECT_TYPE_VLAN", "oid:0x26000000000001")
+        "SAI_OBJECT_TYPE_FDB_ENTRY:{...}"           => ("SAI_OBJECT_TYPE_FDB_ENTRY", "{...}")
+        """
+        obj_type, _, obj_id = key.partition(":")
+        return obj_type, obj_id
+
+    @staticmethod
+    def references(key, attrs):
+        """Return the set of OIDs the object refers to through its key or attributes"""
+        refs = set(OID_PATTERN.findall(SaiAsicStateDiff.split_key(key)[1]))
+        for value in attrs.values():
+            refs.update(OID_PATTERN.findall(value))
+        return refs
+
+    def extra_oids(self):
+        return {obj_id for obj_type, obj_id in map(self.split_key, self.extra) if obj_id.startswith("oid:")}
+
+    def removal_levels(self):
+        """
+        Split the extra objects into the levels to be removed level by level.
+        An object is removed only after all the extra objects that refer to it.
+
+        Returns:
+            List of the levels, each level is the list of the object keys
+
+        Raises:
+            AssertionError: If the dependencies can not be resolved
+        """
+        oid_to_key = {}
+        for key in self.extra:
+            obj_id = self.split_key(key)[1]
+            if obj_id.startswith("oid:"):
+                oid_to_key[obj_id] = key
+
+        depends_on = {}
+        for key, attrs in self.extra.items():
+            own_oid = self.split_key(key)[1]
+            depends_on[key] = [oid_to_key[oid] for oid in self.references(key, attrs)
+                               if oid in oid_to_key and oid != own_oid]
+        return dependency_levels(depends_on)
+
+    def summary(self):
+        return f"extra: {len(self.extra)}, missing: {len(self.missing)}, " \
+               f"changed: {len(self.changed)}, added attributes: {len(self.added)}"
+
+
+class SaiSnapshot:
+    """
+    Snapshot of SAI entity state.
+
+    Besides ASIC state, it holds the state discovered by the SAI entity
+    (default objects' OIDs, ports, etc.), the objects registry and the sairedis.rec
+    OIDs mapping. So, the SAI entity can be restored without re-discovery.
+
+    Attributes:
+        asic_state: ASIC state (see SaiAsicStateDiff)
+        fields: Dictionary mapping SAI entity attribute name to its value
+        objects_registry: CommandProcessor objects registry
+        rec2vid: sairedis.rec OIDs mapping
+        object_graph: Dependency graph of the created objects (see SaiObjectGraph)
+    """
+
+    def __init__(self, asic_state, fields, objects_registry, rec2vid, object_graph):
+        self.asic_state = asic_state
+        self.fields = copy.deepcopy(fields)
+        self.objects_registry = copy.deepcopy(objects_registry)
+        self.rec2vid = rec2vid.copy()
+        self.object_graph = object_graph.copy()
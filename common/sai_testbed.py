@@ -4,6 +4,9 @@ import json
 import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from saichallenger.common.sai_dut import SaiDut
 from saichallenger.common.sai_npu import SaiNpu
@@ -101,6 +104,9 @@ class SaiTestbedMeta():
 
 
 class SaiTestbed():
+    # Serialize ASIC specific modules loading across the spawning threads
+    import_lock = threading.Lock()
+
     def __init__(self, base_dir, name, with_traffic, skip_dataplane=False):
         self.meta = SaiTestbedMeta(base_dir, name)
         self.dut = []
@@ -112,13 +118,16 @@ class SaiTestbed():
         self.base_dir = base_dir
         self.with_traffic = with_traffic
         self.skip_dataplane = skip_dataplane
+        # Entity name -> spawn/init duration in seconds
+        self.init_timings = {}
 
     @staticmethod
     def import_module(root_path, module_name):
-        module_specs = importlib.util.spec_from_file_location(module_name, os.path.join(root_path, f"{module_name}.py"))
-        module = importlib.util.module_from_spec(module_specs)
-        sys.modules[module_name] = module
-        module_specs.loader.exec_module(module)
+        with SaiTestbed.import_lock:
+            module_specs = importlib.util.spec_from_file_location(module_name, os.path.join(root_path, f"{module_name}.py"))
+            module = importlib.util.module_from_spec(module_specs)
+            sys.modules[module_name] = module
+            module_specs.loader.exec_module(module)
         return module
 
     @staticmethod
@@ -181,42 +190,75 @@ class SaiTestbed():
         '''
         return SaiDut.spawn(cfg)
 
+    def spawn_entity(self, cfg, asic_type):
+        if cfg["client"]["config"].get("mode", None):
+            cfg["client"]["config"]["alias"] = cfg["alias"]
+            cfg["dut"] = self.spawn_dut(cfg["client"]["config"])
+        cfg["traffic"] = self.with_traffic
+        return self.spawn_asic(self.base_dir, cfg, asic_type)
+
+    def timed(self, name, task):
+        '''
+        Run the task and store its duration into `init_timings`.
+        '''
+        start = time.monotonic()
+        try:
+            return task()
+        finally:
+            self.init_timings[name] = time.monotonic() - start
+
+    @staticmethod
+    def run_concurrently(tasks):
+        '''
+        Run the independent tasks concurrently and wait for all of them to complete.
+
+        Parameters:
+            tasks (list): The list of (name, callable) tuples.
+        Returns:
+            The list of the tasks' results in the order of the tasks.
+        Raises:
+            AssertionError: If any of the tasks failed. All failures are reported.
+        '''
+        if not tasks:
+            return []
+
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = [executor.submit(task) for _, task in tasks]
+
+        failures = []
+        for (name, _), future in zip(tasks, futures):
+            if future.exception() is not None:
+                logging.error(f"{name} failed", exc_info=future.exception())
+                failures.append(f"{name}: {future.exception()!r}")
+        assert not failures, "Testbed initialization failed:\n" + "\n".join(failures)
+        return [future.result() for future in futures]
+
     def spawn(self):
         if self.npu or self.dpu or self.phy:
             # to avoid to be executed more than once
             return
 
-        for npu_cfg in self.meta.config.get("npu", []):
-            if npu_cfg["client"]["config"].get("mode", None):
-                npu_cfg["client"]["config"]["alias"] = npu_cfg["alias"]
-                dut = self.spawn_dut(npu_cfg["client"]["config"])
-                self.dut.append(dut)
-                npu_cfg["dut"] = dut
-            npu_cfg["traffic"] = self.with_traffic
-            asic = self.spawn_asic(self.base_dir, npu_cfg, "npu")
-            self.npu.append(asic)
-        for dpu_cfg in self.meta.config.get("dpu", []):
-            if dpu_cfg["client"]["config"].get("mode", None):
-                dpu_cfg["client"]["config"]["alias"] = dpu_cfg["alias"]
-                dut = self.spawn_dut(dpu_cfg["client"]["config"])
-                self.dut.append(dut)
-                dpu_cfg["dut"] = dut
-            dpu_cfg["traffic"] = self.with_traffic
-            asic = self.spawn_asic(self.base_dir, dpu_cfg, "dpu")
-            self.dpu.append(asic)
-        for phy_cfg in self.meta.config.get("phy", []):
-            if phy_cfg["client"]["config"].get("mode", None):
-                phy_cfg["client"]["config"]["alias"] = phy_cfg["alias"]
-                dut = self.spawn_dut(phy_cfg["client"]["config"])
-                self.dut.append(dut)
-                phy_cfg["dut"] = dut
-            phy_cfg["traffic"] = self.with_traffic
-            asic = self.spawn_asic(self.base_dir, phy_cfg, "phy")
-            self.phy.append(asic)
-        for dataplane_cfg in self.meta.config.get("dataplane") or []:
-            dataplane_cfg["traffic"] = self.with_traffic
-            dp = self.spawn_dataplane(dataplane_cfg)
-            self.dataplane.append(dp)
+        asic_cfgs = []
+        tasks = []
+        for asic_type in ["npu", "dpu", "phy"]:
+            for cfg in self.meta.config.get(asic_type, []):
+                name = f"spawn {asic_type} {cfg.get('alias')}"
+                asic_cfgs.append((asic_type, cfg))
+                tasks.append((name, lambda name=name, cfg=cfg, asic_type=asic_type:
+                              self.timed(name, lambda: self.spawn_entity(cfg, asic_type))))
+        dataplane_cfgs = self.meta.config.get("dataplane") or []
+        for cfg in dataplane_cfgs:
+            cfg["traffic"] = self.with_traffic
+            name = f"spawn dataplane {cfg.get('alias')}"
+            tasks.append((name, lambda name=name, cfg=cfg: self.timed(name, lambda: self.spawn_dataplane(cfg))))
+
+        entities = self.run_concurrently(tasks)
+
+        for (asic_type, cfg), asic in zip(asic_cfgs, entities):
+            if cfg.get("dut") is not None:
+                self.dut.append(cfg["dut"])
+            getattr(self, asic_type).append(asic)
+        self.dataplane.extend(entities[len(asic_cfgs):])
 
     def init(self):
         """
@@ -224,18 +266,33 @@ class SaiTestbed():
         """
         self.spawn()
 
-        for dut in self.dut:
-            dut.init()
-
-        for npu in self.npu:
-            npu.reset()
-        for dpu in self.dpu:
-            dpu.reset()
-        for phy in self.phy:
-            phy.reset()
+        self.run_concurrently([
+            (f"init dut {idx}", lambda idx=idx, dut=dut: self.timed(f"init dut {idx}", dut.init))
+            for idx, dut in enumerate(self.dut)
+        ])
+
+        # The SAI entities served by the same Redis/Thrift server are reset sequentially,
+        # since the reset of one of them restarts the server.
+        groups = {}
+        for asic_type in ["npu", "dpu", "phy"]:
+            for asic in getattr(self, asic_type):
+                client_cfg = asic.cfg["client"]["config"]
+                server = f"{client_cfg.get('ip')}:{client_cfg.get('port')}"
+                groups.setdefault(server, []).append((f"reset {asic_type} {asic.cfg.get('alias')}", asic))
+
+        def reset_group(group):
+            for name, asic in group:
+                self.timed(name, asic.reset)
+
+        tasks = [(f"reset {server}", lambda group=group: reset_group(group)) for server, group in groups.items()]
         if not self.skip_dataplane:
             for dp in self.dataplane:
-                dp.init()
+                name = f"init dataplane {dp.config.get('alias')}"
+                tasks.append((name, lambda name=name, dp=dp: self.timed(name, dp.init)))
+        self.run_concurrently(tasks)
+
+        logging.info("Testbed initialization timings: " +
+                     ", ".join(f"{name}: {duration:.2f}s" for name, duration in self.init_timings.items()))
 
     def deinit(self):
         """
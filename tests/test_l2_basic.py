@@ -1,4 +1,5 @@
 import ipaddress
+import json
 import pytest
 import time
 from saichallenger.common.sai_data import SaiObjType
@@ -14,7 +15,7 @@ def skip_all(testbed_instance):
 @pytest.fixture(autouse=True)
 def on_prev_test_failure(prev_test_failed, npu):
     if prev_test_failed:
-        npu.reset()
+        npu.soft_reset()
 
 
 def test_l2_access_to_access_vlan(npu, dataplane):
@@ -829,6 +830,98 @@ def test_fdb_bulk_remove(npu, dataplane):
         npu.flush_fdb_entries(npu.switch_oid, ["SAI_FDB_FLUSH_ATTR_BV_ID", npu.default_vlan_oid, "SAI_FDB_FLUSH_ATTR_ENTRY_TYPE", "SAI_FDB_FLUSH_ENTRY_TYPE_ALL"])
 
 
+def test_fdb_batch(npu, dataplane):
+    """
+    Description:
+    Create and remove FDB entries within the batch context and check with the traffic.
+
+    Test scenario:
+    1. Create FDB entries within the batch context
+    2. Check the entries are submitted on exit from the batch context
+    3. Check no flooding for created FDB entries
+    4. Remove FDB entries within the batch context
+    5. Check flooding if no FDB entry
+    """
+    src_mac = '00:00:00:11:22:33'
+    macs = ['00:11:11:11:11:11', '00:22:22:22:22:22',
+            '00:33:33:33:33:33', '00:44:44:44:44:44']
+
+    try:
+        with npu.batch():
+            futures = [npu.create_fdb(npu.default_vlan_oid, mac, npu.dot1q_bp_oids[0]) for mac in macs]
+            assert not any(future.done() for future in futures)
+        assert [future.result()["mac"] for future in futures] == macs
+
+        for mac in macs:
+            key = 'SAI_OBJECT_TYPE_FDB_ENTRY:' + json.dumps({
+                "bvid"      : npu.default_vlan_oid,
+                "mac"       : mac,
+                "switch_id" : npu.switch_oid
+            })
+            bp_oid = npu.get(key, ["SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", "oid:0x0"]).oid()
+            assert bp_oid == npu.dot1q_bp_oids[0]
+
+        if npu.run_traffic:
+            # Check no flooding for created FDB entries
+            for mac in macs:
+                pkt = simple_tcp_packet(eth_dst=mac, eth_src=src_mac)
+                send_packet(dataplane, 1, pkt)
+                verify_packets(dataplane, pkt, [0])
+
+        with npu.batch():
+            for mac in macs:
+                npu.remove_fdb(npu.default_vlan_oid, mac)
+
+        if npu.run_traffic:
+            # Check flooding if no FDB entry
+            egress_ports = list(range(len(npu.port_oids)))
+            egress_ports.remove(1)
+            for mac in macs:
+                pkt = simple_tcp_packet(eth_dst=mac, eth_src=src_mac)
+                send_packet(dataplane, 1, pkt)
+                verify_packets(dataplane, pkt, egress_ports)
+
+    finally:
+        npu.flush_fdb_entries(npu.switch_oid, ["SAI_FDB_FLUSH_ATTR_BV_ID", npu.default_vlan_oid, "SAI_FDB_FLUSH_ATTR_ENTRY_TYPE", "SAI_FDB_FLUSH_ENTRY_TYPE_ALL"])
+
+
+def test_fdb_batch_key_spelling(npu):
+    """
+    Description:
+    Check the batched FDB entries keys are accepted in any spelling the single operations accept.
+
+    Test scenario:
+    1. Create FDB entries with "bv_id"/"mac_address" keys within the batch context
+    2. Check the entries are created
+    3. Remove FDB entries with the same keys within the batch context
+    """
+    macs = ['00:11:11:11:11:11', '00:22:22:22:22:22']
+    keys = ['SAI_OBJECT_TYPE_FDB_ENTRY:' + json.dumps({
+        "bv_id"       : npu.default_vlan_oid,
+        "mac_address" : mac,
+        "switch_id"   : npu.switch_oid
+    }) for mac in macs]
+    attrs = [
+        "SAI_FDB_ENTRY_ATTR_TYPE",           "SAI_FDB_ENTRY_TYPE_STATIC",
+        "SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", npu.dot1q_bp_oids[0]
+    ]
+
+    try:
+        with npu.batch():
+            futures = [npu.create(key, attrs) for key in keys]
+        assert all(future.exception() is None for future in futures)
+
+        for key in keys:
+            bp_oid = npu.get(key, ["SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", "oid:0x0"]).oid()
+            assert bp_oid == npu.dot1q_bp_oids[0]
+
+        with npu.batch():
+            futures = [npu.remove(key) for key in keys]
+        assert all(future.exception() is None for future in futures)
+    finally:
+        npu.flush_fdb_entries(npu.switch_oid, ["SAI_FDB_FLUSH_ATTR_BV_ID", npu.default_vlan_oid, "SAI_FDB_FLUSH_ATTR_ENTRY_TYPE", "SAI_FDB_FLUSH_ENTRY_TYPE_ALL"])
+
+
 def test_l2_mac_move_1(npu, dataplane):
     """
     Description:
@@ -910,3 +1003,62 @@ def test_l2_mac_move_1(npu, dataplane):
             npu.set(npu.port_oids[idx], ["SAI_PORT_ATTR_PORT_VLAN_ID", npu.default_vlan_id])
 
         npu.remove(vlan_oid)
+
+
+def test_l2_snapshot_restore(npu):
+    """
+    Description:
+    Check the switch is restored to the snapshot state
+
+    Test scenario:
+    1. Take the snapshot
+    2. Create VLAN 30 with the tagged member and the FDB entry
+    3. Restore the snapshot
+    4. Verify VLAN 30, its member and the FDB entry are removed
+    """
+    try:
+        snapshot = npu.snapshot()
+    except NotImplementedError:
+        pytest.skip("ASIC state retrieval is not supported")
+
+    vlan_oid = npu.create(SaiObjType.VLAN, ["SAI_VLAN_ATTR_VLAN_ID", "30"])
+    vlan_mbr_oid = npu.create_vlan_member(vlan_oid, npu.dot1q_bp_oids[0], "SAI_VLAN_TAGGING_MODE_TAGGED")
+    npu.create_fdb(vlan_oid, "00:30:00:00:00:01", npu.dot1q_bp_oids[0])
+
+    npu.restore(snapshot)
+
+    assert vlan_oid not in npu.get_object_key(SaiObjType.VLAN)["VLAN"]
+    assert vlan_mbr_oid not in npu.get_object_key(SaiObjType.VLAN_MEMBER)["VLAN_MEMBER"]
+    assert npu.get_asic_state() == snapshot.asic_state
+
+
+def test_l2_teardown_all(npu):
+    """
+    Description:
+    Check all the objects created after init are removed in dependency order
+
+    Test scenario:
+    1. Create VLAN 40 with the tagged member and the FDB entries,
+       one of them with "bv_id"/"mac_address" key
+    2. Tear down all the created objects
+    3. Verify VLAN 40, its member and the FDB entries are removed
+    """
+    vlan_oid = npu.create(SaiObjType.VLAN, ["SAI_VLAN_ATTR_VLAN_ID", "40"])
+    vlan_mbr_oid = npu.create_vlan_member(vlan_oid, npu.dot1q_bp_oids[0], "SAI_VLAN_TAGGING_MODE_TAGGED")
+    npu.create_fdb(vlan_oid, "00:40:00:00:00:01", npu.dot1q_bp_oids[0])
+    npu.create('SAI_OBJECT_TYPE_FDB_ENTRY:' + json.dumps({
+                   "bv_id"       : vlan_oid,
+                   "mac_address" : "00:40:00:00:00:02",
+                   "switch_id"   : npu.switch_oid
+               }),
+               [
+                   "SAI_FDB_ENTRY_ATTR_TYPE",           "SAI_FDB_ENTRY_TYPE_STATIC",
+                   "SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", npu.dot1q_bp_oids[0]
+               ])
+    assert vlan_oid in npu.object_graph and vlan_mbr_oid in npu.object_graph
+
+    npu.teardown_all()
+
+    assert len(npu.object_graph) == 0
+    assert vlan_oid not in npu.get_object_key(SaiObjType.VLAN)["VLAN"]
+    assert vlan_mbr_oid not in npu.get_object_key(SaiObjType.VLAN_MEMBER)["VLAN_MEMBER"]
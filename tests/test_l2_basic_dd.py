@@ -1,3 +1,4 @@
+import json
 import pytest
 from ptf.testutils import simple_tcp_packet, send_packet, verify_packets
 
@@ -5,10 +6,12 @@ from ptf.testutils import simple_tcp_packet, send_packet, verify_packets
 def discovery(npu):
      npu.objects_discovery()
 
-def test_l2_trunk_to_trunk_vlan_dd(npu, dataplane):
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_l2_trunk_to_trunk_vlan_dd(npu, dataplane, concurrent):
     """
     Description:
-    Check trunk to trunk VLAN members forwarding
+    Check trunk to trunk VLAN members forwarding.
+    The commands are applied either one by one or concurrently.
 
     #1. Create a VLAN 10
     #2. Add two ports as tagged members to the VLAN
@@ -58,7 +61,7 @@ def test_l2_trunk_to_trunk_vlan_dd(npu, dataplane):
                 "SAI_FDB_ENTRY_ATTR_PACKET_ACTION", "SAI_PACKET_ACTION_FORWARD"
             ]
         })
-    status = [*npu.process_commands(cmds)]
+    status = [*npu.process_commands(cmds, concurrent=concurrent)]
 
     cmds2 = [
         {
@@ -77,7 +80,7 @@ def test_l2_trunk_to_trunk_vlan_dd(npu, dataplane):
             ]
         }
     ]
-    status = [*npu.process_commands(cmds2)]
+    status = [*npu.process_commands(cmds2, concurrent=concurrent)]
     # command #0
     assert status[0] == "SAI_STATUS_SUCCESS"
     # command #1, attribute #0
@@ -98,4 +101,94 @@ def test_l2_trunk_to_trunk_vlan_dd(npu, dataplane):
             send_packet(dataplane, 0, pkt)
             verify_packets(dataplane, pkt, [1])
     finally:
-        status = [*npu.process_commands(cmds, cleanup=True)]
+        status = [*npu.process_commands(cmds, cleanup=True, concurrent=concurrent)]
+
+
+def test_l2_vlan_members_dd_concurrent(npu):
+    """
+    Description:
+    Check data-driven configuration applied with multiple SAI operations in flight
+
+    #1. Create a VLAN 20 and add all bridge ports as tagged members concurrently
+    #2. Verify the results are returned in the order of the commands
+    #3. Verify VLAN member list
+    #4. Clean up configuration concurrently
+    """
+    cmds = [{
+        "name": "vlan_20",
+        "op": "create",
+        "type": "SAI_OBJECT_TYPE_VLAN",
+        "attributes": [
+            "SAI_VLAN_ATTR_VLAN_ID", "20"
+        ]
+    }]
+
+    for idx in range(len(npu.dot1q_bp_oids)):
+        cmds.append({
+            "name": f"vlan_20_member_{idx}",
+            "op": "create",
+            "type": "SAI_OBJECT_TYPE_VLAN_MEMBER",
+            "attributes": [
+                "SAI_VLAN_MEMBER_ATTR_VLAN_ID", "$vlan_20",
+                "SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID", f"$BRIDGE_PORT_{idx}",
+                "SAI_VLAN_MEMBER_ATTR_VLAN_TAGGING_MODE", "SAI_VLAN_TAGGING_MODE_TAGGED"
+            ]
+        })
+
+    try:
+        oids = [*npu.process_commands(cmds, concurrent=True)]
+        assert len(oids) == len(cmds)
+        for idx, cmd in enumerate(cmds):
+            assert npu.get_key_by_alias(cmd["name"])["oid"] == oids[idx]
+
+        members = npu.get(oids[0], ["SAI_VLAN_ATTR_MEMBER_LIST"]).oids()
+        assert sorted(members) == sorted(oids[1:])
+    finally:
+        status = [*npu.process_commands(cmds, cleanup=True, concurrent=True)]
+        assert all(s == "SAI_STATUS_SUCCESS" for s in status)
+
+
+def test_l2_fdb_dd_compiled(npu):
+    """
+    Description:
+    Check compiled data-driven configuration
+
+    #1. Create a VLAN 30 and FDB entries in VLAN 30 from the compiled commands
+    #2. Verify the FDB entries keys refer to VLAN 30
+    #3. Clean up configuration
+    """
+    cmds = [{
+        "name": "vlan_30",
+        "op": "create",
+        "type": "SAI_OBJECT_TYPE_VLAN",
+        "attributes": [
+            "SAI_VLAN_ATTR_VLAN_ID", "30"
+        ]
+    }]
+
+    for idx in range(16):
+        cmds.append({
+            "name": f"vlan_30_fdb_{idx}",
+            "op": "create",
+            "type": "SAI_OBJECT_TYPE_FDB_ENTRY",
+            "key": {
+                "bvid": "$vlan_30",
+                "mac": f"00:30:00:00:00:{idx:02x}",
+                "switch_id": "$SWITCH_ID"
+            },
+            "attributes": [
+                "SAI_FDB_ENTRY_ATTR_TYPE", "SAI_FDB_ENTRY_TYPE_STATIC",
+                "SAI_FDB_ENTRY_ATTR_BRIDGE_PORT_ID", "$BRIDGE_PORT_0",
+                "SAI_FDB_ENTRY_ATTR_PACKET_ACTION", "SAI_PACKET_ACTION_FORWARD"
+            ]
+        })
+
+    plan = npu.command_processor.compile(cmds)
+    try:
+        results = [*npu.process_commands(plan)]
+        vlan_oid = results[0]
+        for idx in range(1, len(cmds)):
+            assert vlan_oid in json.dumps(npu.get_key_by_alias(cmds[idx]["name"])["key"])
+    finally:
+        status = [*npu.process_commands(plan, cleanup=True)]
+        assert all(s == "SAI_STATUS_SUCCESS" for s in status)
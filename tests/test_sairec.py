@@ -1,5 +1,8 @@
+import gzip
+import json
 import pytest
 import time
+from saichallenger.common.sai_rec import parse_rec, read_rec, rotated_files
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -54,6 +57,24 @@ def test_apply_sairec(npu, dataplane, fname, bcm56850_teardown):
     npu.apply_rec("/sai/sonic-sairedis/tests/" + fname)
 
 
+@pytest.mark.parametrize(
+    "fname",
+    [
+        "BCM56850/full.rec",
+        "BCM56850/bulk_fdb.rec",
+        "BCM56850/bulk_route.rec",
+    ],
+)
+def test_apply_sairec_batched(npu, dataplane, fname, bcm56850_teardown):
+    if npu.name not in ["BCM56850", "trident2"]:
+        pytest.skip("VS specific scenario")
+
+    if npu.sai_client.config["ip"] != 'localhost':
+        pytest.skip("Currently not supported in client-server mode")
+
+    npu.apply_rec("/sai/sonic-sairedis/tests/" + fname, concurrent=True, batched=True, verbose=0)
+
+
 @pytest.mark.parametrize(
     "fname",
     [
@@ -80,3 +101,110 @@ def test_tofino_scenario(npu, dataplane, fname, tofino_teardown):
         pytest.skip("Tofino specific scenario")
 
     npu.apply_rec(f"/sai-challenger/npu/intel/{npu.name}/{npu.target}/scenarios/{fname}")
+
+
+def test_apply_sairec_stats(npu, dataplane, bcm56850_teardown, tmp_path):
+    if npu.name not in ["BCM56850", "trident2"]:
+        pytest.skip("VS specific scenario")
+
+    if npu.sai_client.config["ip"] != 'localhost':
+        pytest.skip("Currently not supported in client-server mode")
+
+    stats_file = tmp_path / "stats.json"
+    trace_file = tmp_path / "trace.jsonl"
+    stats = npu.apply_rec("/sai/sonic-sairedis/tests/BCM56850/bulk_route.rec", verbose=0,
+                          stats_file=str(stats_file), trace_file=str(trace_file))
+
+    assert stats["records"] > 0
+    assert stats["bulk_sizes"]["count"] > 0
+    assert "SAI_OBJECT_TYPE_ROUTE_ENTRY" in stats["object_types"]
+    assert json.loads(stats_file.read_text()) == stats
+    assert len(trace_file.read_text().splitlines()) == stats["records"]
+
+
+@pytest.mark.parametrize("speed", [None, 1, 10])
+def test_apply_sairec_paced(npu, dataplane, speed, bcm56850_teardown):
+    if npu.name not in ["BCM56850", "trident2"]:
+        pytest.skip("VS specific scenario")
+
+    if npu.sai_client.config["ip"] != 'localhost':
+        pytest.skip("Currently not supported in client-server mode")
+
+    stats = npu.apply_rec("/sai/sonic-sairedis/tests/BCM56850/bridge_create_1.rec", verbose=0, speed=speed)
+    assert stats["schedule"]["records"] > 0
+    assert stats["schedule"]["final_lag"] is not None
+
+
+def test_sairec_rotated_files(tmp_path):
+    fname = str(tmp_path / "sairedis.rec")
+    assert rotated_files(fname) == []
+
+    # The oldest records are in the file with the highest index
+    with gzip.open(fname + ".2.gz", "wt") as f:
+        f.write("2024-01-01.00:00:00.000001|c|SAI_OBJECT_TYPE_SWITCH:oid:0x21000000000000|"
+                "SAI_SWITCH_ATTR_INIT_SWITCH=true\n")
+    (tmp_path / "sairedis.rec.1").write_text(
+        "2024-01-01.00:00:00.000002|#|recording on: sairedis.rec.1\n"
+        "2024-01-01.00:00:00.000003|s|SAI_OBJECT_TYPE_SWITCH:oid:0x21000000000000|"
+        "SAI_SWITCH_ATTR_SRC_MAC_ADDRESS=00:11:22:33:44:55\n")
+    # The gzip compressed file is detected by its content, not by its name
+    with gzip.open(fname, "wt") as f:
+        f.write("2024-01-01.00:00:00.000004|g|SAI_OBJECT_TYPE_SWITCH:oid:0x21000000000000|"
+                "SAI_SWITCH_ATTR_PORT_NUMBER=0\n"
+                "2024-01-01.00:00:00.000005|G|SAI_STATUS_SUCCESS|SAI_SWITCH_ATTR_PORT_NUMBER=32\n"
+                "2024-01-01.00:00:00.000006|n|switch_shutdown_request||\n")
+    # The gap in the indexes ends the rotated files
+    (tmp_path / "sairedis.rec.4").write_text("2024-01-01.00:00:00.000000|#|stale\n")
+
+    fnames = rotated_files(fname)
+    assert fnames == [fname + ".2.gz", fname + ".1", fname]
+    assert [cnt for cnt, _ in read_rec(fnames)] == [1, 2, 3, 4, 5, 6]
+
+    records = list(parse_rec(read_rec(fnames)))
+    assert [cnt for cnt, _, _ in records] == [1, 3, 4, 5]
+    assert [record[0][0] for _, _, record in records] == ["c", "s", "g", "G"]
+    assert records[0][1] == "2024-01-01.00:00:00.000001"
+    assert records[3][2] == [["G", "SAI_STATUS_SUCCESS", "SAI_SWITCH_ATTR_PORT_NUMBER=32"]]
+
+    # Only the requested actions are parsed
+    records = list(parse_rec(read_rec(fnames), actions="cs"))
+    assert [record[0][0] for _, _, record in records] == ["c", "s"]
+
+
+@pytest.mark.parametrize(
+    "fname",
+    [
+        "BCM56850/bridge_create_1.rec",
+        "BCM56850/bulk_route.rec",
+    ],
+)
+def test_apply_sairec_compressed(npu, dataplane, fname, bcm56850_teardown, tmp_path):
+    if npu.name not in ["BCM56850", "trident2"]:
+        pytest.skip("VS specific scenario")
+
+    if npu.sai_client.config["ip"] != 'localhost':
+        pytest.skip("Currently not supported in client-server mode")
+
+    def replay(fnames):
+        stats = npu.apply_rec(fnames, verbose=0)
+        actions = {name: (group["records"], group["entries"]) for name, group in stats["actions"].items()}
+        return stats["records"], stats["entries"], actions, sorted(npu.rec2vid)
+
+    fname = "/sai/sonic-sairedis/tests/" + fname
+    with open(fname) as f:
+        lines = f.readlines()
+    expected = replay(fname)
+    assert expected[0] > 0
+
+    compressed = str(tmp_path / "sairedis.rec.gz")
+    with gzip.open(compressed, "wt") as f:
+        f.writelines(lines)
+    assert replay(compressed) == expected
+
+    rotated = str(tmp_path / "sairedis.rec")
+    with gzip.open(rotated + ".1.gz", "wt") as f:
+        f.writelines(lines[:len(lines) // 2])
+    with open(rotated, "w") as f:
+        f.writelines(lines[len(lines) // 2:])
+    assert rotated_files(rotated) == [rotated + ".1.gz", rotated]
+    assert replay(rotated_files(rotated)) == expected
@@ -28,7 +28,7 @@ def skip_all(testbed_instance):
 @pytest.fixture(autouse=True)
 def on_prev_test_failure(prev_test_failed, npu):
     if prev_test_failed:
-        npu.reset()
+        npu.soft_reset()
 
 
 @pytest.fixture(scope="module")
@@ -1,5 +1,7 @@
 import pytest
+import time
 from saichallenger.common.sai_data import SaiObjType
+from sai_client.sai_redis_client.sai_redis_client import SaiRedisClient
 
 TEST_VLAN_ID = "100"
 
@@ -254,3 +256,42 @@ def test_vlan_mbr_set_negative(npu, dataplane, sai_vlan_member, attr):
     elif attr == "SAI_VLAN_MEMBER_ATTR_BRIDGE_PORT_ID":
         status = npu.set(sai_vlan_member[0], [attr, npu.dot1q_bp_oids[0]], False)
     assert status != "SAI_STATUS_SUCCESS"
+
+
+def test_vlan_member_index(npu, dataplane, sai_vlan_member):
+    vlan_mbr_oid, vlan_oid = sai_vlan_member
+    assert npu.get_vlan_member(vlan_oid, npu.dot1q_bp_oids[0]) == vlan_mbr_oid
+    assert npu.get_vlan_member(npu.default_vlan_oid, npu.dot1q_bp_oids[0]) is None
+    # The index must be consistent with the switch state
+    for oid in [vlan_oid, npu.default_vlan_oid]:
+        assert npu.get_vlan_members(oid) == npu.get_vlan_members(oid, refresh=True)
+
+
+def test_vlan_async_response_timeout(npu, monkeypatch):
+    """
+    Check the response timeout of the asynchronous operation fails all the outstanding operations,
+    so the late responses are not matched to the wrong requests.
+    """
+    if not isinstance(npu.sai_client, SaiRedisClient):
+        pytest.skip("Redis client specific scenario")
+
+    # Simulate the responses delayed beyond the timeout
+    monkeypatch.setattr(npu.sai_client, "attempts", 1)
+    monkeypatch.setattr(npu.sai_client, "_SaiRedisClient__pop_async_response", lambda: [])
+    futures = [npu.create_async(SaiObjType.VLAN, ["SAI_VLAN_ATTR_VLAN_ID", str(vlan_id)], do_assert=False)
+               for vlan_id in range(200, 203)]
+    npu.flush()
+    monkeypatch.undo()
+
+    assert all(future.exception() is not None for future in futures)
+    assert "lost" in str(futures[-1].exception())
+
+    # Let the late responses arrive. They must not be taken as the response of the next request.
+    time.sleep(1)
+    vlan_oid = npu.create(SaiObjType.VLAN, ["SAI_VLAN_ATTR_VLAN_ID", "203"])
+    assert npu.get(vlan_oid, ["SAI_VLAN_ATTR_VLAN_ID", ""]).value() == "203"
+    npu.remove(vlan_oid)
+
+    # The requests have been executed by syncd
+    for future in futures:
+        npu.remove(future.key, do_assert=False)